@@ -0,0 +1,19 @@
+from datetime import datetime
+from typing import Optional
+
+from fastapi import Request, Response
+
+
+def apply_etag(request: Request, response: Response, updated_at: datetime) -> Optional[Response]:
+    """Handle conditional GETs on detail endpoints.
+
+    Derives a weak ETag from the row's updated_at; if the client sent a
+    matching If-None-Match, returns an empty 304 so dashboards polling an
+    unchanged resource skip the serialization and the response body
+    entirely. Otherwise stamps the ETag header and returns None.
+    """
+    etag = f'W/"{updated_at.timestamp()}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304)
+    response.headers["ETag"] = etag
+    return None
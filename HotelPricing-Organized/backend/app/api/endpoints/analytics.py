@@ -1,152 +1,171 @@
 from typing import List, Optional, Dict, Any
 from datetime import datetime, date, timedelta
+import pandas as pd
+import numpy as np
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, extract
+from sqlalchemy import func, bindparam, exists, lambda_stmt, select, Integer, Numeric, cast
 
+from app.core.cache import analytics_ttl, cache_get, cache_set
 from app.db.session import get_db
+from app.db.views import get_last_refreshed
 from app.models.hotel import Hotel, RoomType, RoomPricing
+from app.services.analytics import aggregate_pricing
 
-router = APIRouter()
+# Analytics payloads can run to thousands of nested dicts; orjson serializes
+# them several times faster than the default json-based response class
+router = APIRouter(default_response_class=ORJSONResponse)
 
 
-@router.get("/revenue/{hotel_id}")
-def get_revenue_analytics(
-    hotel_id: int,
-    start_date: Optional[date] = None,
-    end_date: Optional[date] = None,
-    room_type_id: Optional[int] = None,
-    group_by: str = "day",  # day, week, month
-    db: Session = Depends(get_db)
-):
+def _revenue_kernel(inventory, occupancy, price, variable_cost):
+    """Compute (occupied, revenue, variable cost, contribution) over aligned arrays.
+
+    One pass of ndarray arithmetic per output column; callers hand in raw
+    column arrays so the whole batch is computed without interpreter-level
+    per-row work.
     """
-    Get revenue analytics for a hotel.
+    occupied = np.round(inventory * occupancy).astype(np.int64)
+    revenue = occupied * price
+    variable_cost_total = occupied * variable_cost
+    contribution = revenue - variable_cost_total
+    return occupied, revenue, variable_cost_total, contribution
+
+
+# Statement cached by lambda identity so SQLAlchemy skips re-building and
+# re-compiling the probe on every request
+_HOTEL_EXISTS = lambda_stmt(
+    lambda: select(exists().where(Hotel.id == bindparam("id")))
+)
+
+
+def _assert_hotel(db: Session, hotel_id: int) -> None:
+    """Raise 404 unless the hotel exists, via an EXISTS probe.
+
+    No Hotel columns are needed here, so this avoids hydrating the row.
     """
-    # Check if hotel exists
-    hotel = db.query(Hotel).filter(Hotel.id == hotel_id).first()
-    if not hotel:
+    if not db.execute(_HOTEL_EXISTS, {"id": hotel_id}).scalar():
         raise HTTPException(
             status_code=404,
             detail=f"Hotel with ID {hotel_id} not found"
         )
-    
-    # Set default date range if not provided
+
+
+def _get_room_types(db: Session, hotel_id: int, room_type_id: Optional[int]):
+    """Fetch (id, name) rows for the hotel's room types; 404 when none match."""
+    stmt = select(RoomType.id, RoomType.name).where(RoomType.hotel_id == hotel_id)
+    if room_type_id:
+        stmt = stmt.where(RoomType.id == room_type_id)
+
+    room_types = db.execute(stmt).all()
+    if not room_types:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No room types found for hotel ID {hotel_id}"
+        )
+
+    return room_types
+
+
+# Widest range the buffered JSON endpoints will aggregate in one response;
+# anything longer should go through the streaming export
+MAX_RANGE_DAYS = 366
+
+
+def _default_date_range(
+    start_date: Optional[date],
+    end_date: Optional[date],
+    max_days: Optional[int] = MAX_RANGE_DAYS
+):
+    """Fill in the default 30-day window and bound the range size."""
     if not end_date:
         end_date = datetime.now().date()
-    
+
     if not start_date:
         # Default to 30 days before end_date
         start_date = end_date - timedelta(days=30)
-    
-    # Build query for room types
-    room_types_query = db.query(RoomType).filter(RoomType.hotel_id == hotel_id)
-    if room_type_id:
-        room_types_query = room_types_query.filter(RoomType.id == room_type_id)
-    
-    room_types = room_types_query.all()
-    if not room_types:
+
+    if start_date > end_date:
         raise HTTPException(
-            status_code=404,
-            detail=f"No room types found for hotel ID {hotel_id}"
+            status_code=400,
+            detail="start_date must be on or before end_date"
         )
-    
-    # Get room type IDs
-    room_type_ids = [rt.id for rt in room_types]
-    
-    # Build query for pricing data
-    query = db.query(
-        RoomPricing.date,
-        RoomPricing.room_type_id,
-        RoomPricing.final_price,
-        RoomPricing.forecasted_occupancy
-    ).filter(
-        RoomPricing.room_type_id.in_(room_type_ids),
-        RoomPricing.date >= start_date,
-        RoomPricing.date <= end_date
+
+    if max_days is not None and (end_date - start_date).days > max_days:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Date range too large; maximum is {max_days} days. "
+                   "Use the export endpoint for longer ranges."
+        )
+
+    return start_date, end_date
+
+
+class AnalyticsFilters:
+    """Normalized query filters shared by the date-grouped analytics endpoints.
+
+    Resolved once as a dependency, so the endpoint bodies are pure analytics:
+    dates are defaulted and bounded here and group_by is validated at the
+    parameter layer instead of falling through to a day grouping.
+    """
+
+    def __init__(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        room_type_id: Optional[int] = None,
+        group_by: str = Query("day", regex="^(day|week|month)$"),
+    ):
+        self.start_date, self.end_date = _default_date_range(start_date, end_date)
+        self.room_type_id = room_type_id
+        self.group_by = group_by
+
+
+@router.get("/revenue/{hotel_id}")
+def get_revenue_analytics(
+    hotel_id: int,
+    flt: AnalyticsFilters = Depends(),
+    db: Session = Depends(get_db)
+):
+    """
+    Get revenue analytics for a hotel.
+    """
+    _assert_hotel(db, hotel_id)
+    _get_room_types(db, hotel_id, flt.room_type_id)
+
+    buckets = aggregate_pricing(
+        db, hotel_id, flt.start_date, flt.end_date, flt.group_by, flt.room_type_id
     )
-    
-    pricing_data = query.all()
-    
-    # Process data for analytics
-    analytics_data = []
-    room_type_dict = {rt.id: rt for rt in room_types}
-    
-    # Group data by date
-    date_grouped_data = {}
-    for item in pricing_data:
-        date_key = item.date
-        
-        # Adjust key based on group_by parameter
-        if group_by == "week":
-            # Get the Monday of the week
-            date_key = item.date - timedelta(days=item.date.weekday())
-        elif group_by == "month":
-            # Get the first day of the month
-            date_key = date(item.date.year, item.date.month, 1)
-        
-        if date_key not in date_grouped_data:
-            date_grouped_data[date_key] = []
-        
-        date_grouped_data[date_key].append(item)
-    
-    # Calculate analytics for each group
-    for date_key, items in date_grouped_data.items():
-        total_revenue = 0
-        total_rooms = 0
-        total_occupied = 0
-        room_type_breakdown = {}
-        
-        for item in items:
-            room_type = room_type_dict[item.room_type_id]
-            inventory = room_type.inventory_count
-            occupancy = item.forecasted_occupancy
-            occupied_rooms = round(inventory * occupancy)
-            revenue = occupied_rooms * item.final_price
-            
-            total_revenue += revenue
-            total_rooms += inventory
-            total_occupied += occupied_rooms
-            
-            # Add to room type breakdown
-            if item.room_type_id not in room_type_breakdown:
-                room_type_breakdown[item.room_type_id] = {
-                    "room_type_id": item.room_type_id,
-                    "room_type_name": room_type.name,
-                    "revenue": 0,
-                    "rooms": 0,
-                    "occupied": 0,
-                    "occupancy_rate": 0
+
+    # Project the revenue fields out of the shared aggregation
+    analytics_data = [
+        {
+            "date": bucket["date"],
+            "total_revenue": bucket["total_revenue"],
+            "total_rooms": bucket["total_rooms"],
+            "total_occupied": bucket["total_occupied"],
+            "occupancy_rate": bucket["occupancy_rate"],
+            "room_types": [
+                {
+                    "room_type_id": rt["room_type_id"],
+                    "room_type_name": rt["room_type_name"],
+                    "revenue": rt["revenue"],
+                    "rooms": rt["rooms"],
+                    "occupied": rt["occupied"],
+                    "occupancy_rate": rt["occupancy_rate"]
                 }
-            
-            room_type_breakdown[item.room_type_id]["revenue"] += revenue
-            room_type_breakdown[item.room_type_id]["rooms"] += inventory
-            room_type_breakdown[item.room_type_id]["occupied"] += occupied_rooms
-        
-        # Calculate occupancy rates
-        overall_occupancy = total_occupied / total_rooms if total_rooms > 0 else 0
-        
-        for rt_id in room_type_breakdown:
-            rt_data = room_type_breakdown[rt_id]
-            rt_data["occupancy_rate"] = rt_data["occupied"] / rt_data["rooms"] if rt_data["rooms"] > 0 else 0
-        
-        # Add to analytics data
-        analytics_data.append({
-            "date": date_key.isoformat(),
-            "total_revenue": round(total_revenue, 2),
-            "total_rooms": total_rooms,
-            "total_occupied": total_occupied,
-            "occupancy_rate": round(overall_occupancy, 4),
-            "room_types": list(room_type_breakdown.values())
-        })
-    
-    # Sort by date
-    analytics_data.sort(key=lambda x: x["date"])
-    
+                for rt in bucket["room_types"]
+            ]
+        }
+        for bucket in buckets
+    ]
+
     return {
         "hotel_id": hotel_id,
-        "start_date": start_date.isoformat(),
-        "end_date": end_date.isoformat(),
-        "group_by": group_by,
+        "start_date": flt.start_date.isoformat(),
+        "end_date": flt.end_date.isoformat(),
+        "group_by": flt.group_by,
+        "last_refreshed_at": get_last_refreshed(),
         "analytics": analytics_data
     }
 
@@ -154,133 +173,46 @@ def get_revenue_analytics(
 @router.get("/occupancy/{hotel_id}")
 def get_occupancy_analytics(
     hotel_id: int,
-    start_date: Optional[date] = None,
-    end_date: Optional[date] = None,
-    room_type_id: Optional[int] = None,
-    group_by: str = "day",  # day, week, month
+    flt: AnalyticsFilters = Depends(),
     db: Session = Depends(get_db)
 ):
     """
     Get occupancy analytics for a hotel.
     """
-    # Check if hotel exists
-    hotel = db.query(Hotel).filter(Hotel.id == hotel_id).first()
-    if not hotel:
-        raise HTTPException(
-            status_code=404,
-            detail=f"Hotel with ID {hotel_id} not found"
-        )
-    
-    # Set default date range if not provided
-    if not end_date:
-        end_date = datetime.now().date()
-    
-    if not start_date:
-        # Default to 30 days before end_date
-        start_date = end_date - timedelta(days=30)
-    
-    # Build query for room types
-    room_types_query = db.query(RoomType).filter(RoomType.hotel_id == hotel_id)
-    if room_type_id:
-        room_types_query = room_types_query.filter(RoomType.id == room_type_id)
-    
-    room_types = room_types_query.all()
-    if not room_types:
-        raise HTTPException(
-            status_code=404,
-            detail=f"No room types found for hotel ID {hotel_id}"
-        )
-    
-    # Get room type IDs
-    room_type_ids = [rt.id for rt in room_types]
-    
-    # Build query for pricing data
-    query = db.query(
-        RoomPricing.date,
-        RoomPricing.room_type_id,
-        RoomPricing.forecasted_occupancy
-    ).filter(
-        RoomPricing.room_type_id.in_(room_type_ids),
-        RoomPricing.date >= start_date,
-        RoomPricing.date <= end_date
+    _assert_hotel(db, hotel_id)
+    _get_room_types(db, hotel_id, flt.room_type_id)
+
+    buckets = aggregate_pricing(
+        db, hotel_id, flt.start_date, flt.end_date, flt.group_by, flt.room_type_id
     )
-    
-    pricing_data = query.all()
-    
-    # Process data for analytics
-    analytics_data = []
-    room_type_dict = {rt.id: rt for rt in room_types}
-    
-    # Group data by date
-    date_grouped_data = {}
-    for item in pricing_data:
-        date_key = item.date
-        
-        # Adjust key based on group_by parameter
-        if group_by == "week":
-            # Get the Monday of the week
-            date_key = item.date - timedelta(days=item.date.weekday())
-        elif group_by == "month":
-            # Get the first day of the month
-            date_key = date(item.date.year, item.date.month, 1)
-        
-        if date_key not in date_grouped_data:
-            date_grouped_data[date_key] = []
-        
-        date_grouped_data[date_key].append(item)
-    
-    # Calculate analytics for each group
-    for date_key, items in date_grouped_data.items():
-        total_rooms = 0
-        total_occupied = 0
-        room_type_breakdown = {}
-        
-        for item in items:
-            room_type = room_type_dict[item.room_type_id]
-            inventory = room_type.inventory_count
-            occupancy = item.forecasted_occupancy
-            occupied_rooms = round(inventory * occupancy)
-            
-            total_rooms += inventory
-            total_occupied += occupied_rooms
-            
-            # Add to room type breakdown
-            if item.room_type_id not in room_type_breakdown:
-                room_type_breakdown[item.room_type_id] = {
-                    "room_type_id": item.room_type_id,
-                    "room_type_name": room_type.name,
-                    "rooms": 0,
-                    "occupied": 0,
-                    "occupancy_rate": 0
+
+    # Project the occupancy fields out of the shared aggregation
+    analytics_data = [
+        {
+            "date": bucket["date"],
+            "total_rooms": bucket["total_rooms"],
+            "total_occupied": bucket["total_occupied"],
+            "occupancy_rate": bucket["occupancy_rate"],
+            "room_types": [
+                {
+                    "room_type_id": rt["room_type_id"],
+                    "room_type_name": rt["room_type_name"],
+                    "rooms": rt["rooms"],
+                    "occupied": rt["occupied"],
+                    "occupancy_rate": rt["occupancy_rate"]
                 }
-            
-            room_type_breakdown[item.room_type_id]["rooms"] += inventory
-            room_type_breakdown[item.room_type_id]["occupied"] += occupied_rooms
-        
-        # Calculate occupancy rates
-        overall_occupancy = total_occupied / total_rooms if total_rooms > 0 else 0
-        
-        for rt_id in room_type_breakdown:
-            rt_data = room_type_breakdown[rt_id]
-            rt_data["occupancy_rate"] = rt_data["occupied"] / rt_data["rooms"] if rt_data["rooms"] > 0 else 0
-        
-        # Add to analytics data
-        analytics_data.append({
-            "date": date_key.isoformat(),
-            "total_rooms": total_rooms,
-            "total_occupied": total_occupied,
-            "occupancy_rate": round(overall_occupancy, 4),
-            "room_types": list(room_type_breakdown.values())
-        })
-    
-    # Sort by date
-    analytics_data.sort(key=lambda x: x["date"])
-    
+                for rt in bucket["room_types"]
+            ]
+        }
+        for bucket in buckets
+    ]
+
     return {
         "hotel_id": hotel_id,
-        "start_date": start_date.isoformat(),
-        "end_date": end_date.isoformat(),
-        "group_by": group_by,
+        "start_date": flt.start_date.isoformat(),
+        "end_date": flt.end_date.isoformat(),
+        "group_by": flt.group_by,
+        "last_refreshed_at": get_last_refreshed(),
         "analytics": analytics_data
     }
 
@@ -288,152 +220,52 @@ def get_occupancy_analytics(
 @router.get("/contribution-margin/{hotel_id}")
 def get_contribution_margin_analytics(
     hotel_id: int,
-    start_date: Optional[date] = None,
-    end_date: Optional[date] = None,
-    room_type_id: Optional[int] = None,
-    group_by: str = "day",  # day, week, month
+    flt: AnalyticsFilters = Depends(),
     db: Session = Depends(get_db)
 ):
     """
     Get contribution margin analytics for a hotel.
     """
-    # Check if hotel exists
-    hotel = db.query(Hotel).filter(Hotel.id == hotel_id).first()
-    if not hotel:
-        raise HTTPException(
-            status_code=404,
-            detail=f"Hotel with ID {hotel_id} not found"
-        )
-    
-    # Set default date range if not provided
-    if not end_date:
-        end_date = datetime.now().date()
-    
-    if not start_date:
-        # Default to 30 days before end_date
-        start_date = end_date - timedelta(days=30)
-    
-    # Build query for room types
-    room_types_query = db.query(RoomType).filter(RoomType.hotel_id == hotel_id)
-    if room_type_id:
-        room_types_query = room_types_query.filter(RoomType.id == room_type_id)
-    
-    room_types = room_types_query.all()
-    if not room_types:
-        raise HTTPException(
-            status_code=404,
-            detail=f"No room types found for hotel ID {hotel_id}"
-        )
-    
-    # Get room type IDs
-    room_type_ids = [rt.id for rt in room_types]
-    
-    # Build query for pricing data
-    query = db.query(
-        RoomPricing.date,
-        RoomPricing.room_type_id,
-        RoomPricing.final_price,
-        RoomPricing.forecasted_occupancy
-    ).filter(
-        RoomPricing.room_type_id.in_(room_type_ids),
-        RoomPricing.date >= start_date,
-        RoomPricing.date <= end_date
+    _assert_hotel(db, hotel_id)
+    _get_room_types(db, hotel_id, flt.room_type_id)
+
+    buckets = aggregate_pricing(
+        db, hotel_id, flt.start_date, flt.end_date, flt.group_by, flt.room_type_id
     )
-    
-    pricing_data = query.all()
-    
-    # Process data for analytics
-    analytics_data = []
-    room_type_dict = {rt.id: rt for rt in room_types}
-    
-    # Group data by date
-    date_grouped_data = {}
-    for item in pricing_data:
-        date_key = item.date
-        
-        # Adjust key based on group_by parameter
-        if group_by == "week":
-            # Get the Monday of the week
-            date_key = item.date - timedelta(days=item.date.weekday())
-        elif group_by == "month":
-            # Get the first day of the month
-            date_key = date(item.date.year, item.date.month, 1)
-        
-        if date_key not in date_grouped_data:
-            date_grouped_data[date_key] = []
-        
-        date_grouped_data[date_key].append(item)
-    
-    # Calculate analytics for each group
-    for date_key, items in date_grouped_data.items():
-        total_revenue = 0
-        total_variable_cost = 0
-        total_contribution = 0
-        total_rooms = 0
-        total_occupied = 0
-        room_type_breakdown = {}
-        
-        for item in items:
-            room_type = room_type_dict[item.room_type_id]
-            inventory = room_type.inventory_count
-            occupancy = item.forecasted_occupancy
-            occupied_rooms = round(inventory * occupancy)
-            revenue = occupied_rooms * item.final_price
-            variable_cost = occupied_rooms * room_type.variable_cost
-            contribution = revenue - variable_cost
-            
-            total_revenue += revenue
-            total_variable_cost += variable_cost
-            total_contribution += contribution
-            total_rooms += inventory
-            total_occupied += occupied_rooms
-            
-            # Add to room type breakdown
-            if item.room_type_id not in room_type_breakdown:
-                room_type_breakdown[item.room_type_id] = {
-                    "room_type_id": item.room_type_id,
-                    "room_type_name": room_type.name,
-                    "revenue": 0,
-                    "variable_cost": 0,
-                    "contribution": 0,
-                    "contribution_margin": 0,
-                    "rooms": 0,
-                    "occupied": 0
+
+    # Project the contribution fields out of the shared aggregation
+    analytics_data = [
+        {
+            "date": bucket["date"],
+            "total_revenue": bucket["total_revenue"],
+            "total_variable_cost": bucket["total_variable_cost"],
+            "total_contribution": bucket["total_contribution"],
+            "contribution_margin": bucket["contribution_margin"],
+            "total_rooms": bucket["total_rooms"],
+            "total_occupied": bucket["total_occupied"],
+            "room_types": [
+                {
+                    "room_type_id": rt["room_type_id"],
+                    "room_type_name": rt["room_type_name"],
+                    "revenue": rt["revenue"],
+                    "variable_cost": rt["variable_cost"],
+                    "contribution": rt["contribution"],
+                    "contribution_margin": rt["contribution_margin"],
+                    "rooms": rt["rooms"],
+                    "occupied": rt["occupied"]
                 }
-            
-            room_type_breakdown[item.room_type_id]["revenue"] += revenue
-            room_type_breakdown[item.room_type_id]["variable_cost"] += variable_cost
-            room_type_breakdown[item.room_type_id]["contribution"] += contribution
-            room_type_breakdown[item.room_type_id]["rooms"] += inventory
-            room_type_breakdown[item.room_type_id]["occupied"] += occupied_rooms
-        
-        # Calculate contribution margins
-        overall_contribution_margin = total_contribution / total_revenue if total_revenue > 0 else 0
-        
-        for rt_id in room_type_breakdown:
-            rt_data = room_type_breakdown[rt_id]
-            rt_data["contribution_margin"] = rt_data["contribution"] / rt_data["revenue"] if rt_data["revenue"] > 0 else 0
-        
-        # Add to analytics data
-        analytics_data.append({
-            "date": date_key.isoformat(),
-            "total_revenue": round(total_revenue, 2),
-            "total_variable_cost": round(total_variable_cost, 2),
-            "total_contribution": round(total_contribution, 2),
-            "contribution_margin": round(overall_contribution_margin, 4),
-            "total_rooms": total_rooms,
-            "total_occupied": total_occupied,
-            "room_types": list(room_type_breakdown.values())
-        })
-    
-    # Sort by date
-    analytics_data.sort(key=lambda x: x["date"])
-    
+                for rt in bucket["room_types"]
+            ]
+        }
+        for bucket in buckets
+    ]
+
     return {
         "hotel_id": hotel_id,
-        "start_date": start_date.isoformat(),
-        "end_date": end_date.isoformat(),
-        "group_by": group_by,
+        "start_date": flt.start_date.isoformat(),
+        "end_date": flt.end_date.isoformat(),
+        "group_by": flt.group_by,
+        "last_refreshed_at": get_last_refreshed(),
         "analytics": analytics_data
     }
 
@@ -449,134 +281,125 @@ def get_pricing_performance_analytics(
     """
     Get pricing performance analytics for a hotel, comparing suggested vs. final prices.
     """
-    # Check if hotel exists
-    hotel = db.query(Hotel).filter(Hotel.id == hotel_id).first()
-    if not hotel:
-        raise HTTPException(
-            status_code=404,
-            detail=f"Hotel with ID {hotel_id} not found"
-        )
-    
-    # Set default date range if not provided
-    if not end_date:
-        end_date = datetime.now().date()
-    
-    if not start_date:
-        # Default to 30 days before end_date
-        start_date = end_date - timedelta(days=30)
-    
-    # Build query for room types
-    room_types_query = db.query(RoomType).filter(RoomType.hotel_id == hotel_id)
+    start_date, end_date = _default_date_range(start_date, end_date)
+
+    # Serve from cache when an identical request was answered recently
+    cache_key = f"analytics:{hotel_id}:pricing-performance:{start_date.isoformat()}:{end_date.isoformat()}:{room_type_id}"
+    cached = cache_get(cache_key)
+    if cached is not None:
+        return cached
+
+    _assert_hotel(db, hotel_id)
+    room_type_names = {rt.id: rt.name for rt in _get_room_types(db, hotel_id, room_type_id)}
+
+    # Aggregate totals per room type straight off the denormalized pricing
+    # fact columns, so overrides show up immediately and no join is needed
+    occupied_expr = func.round(RoomPricing.inventory_count_snap * RoomPricing.forecasted_occupancy)
+
+    totals_stmt = select(
+        RoomPricing.room_type_id,
+        func.round(cast(func.sum(occupied_expr * RoomPricing.suggested_price), Numeric), 2).label('suggested_revenue'),
+        func.round(cast(func.sum(occupied_expr * RoomPricing.final_price), Numeric), 2).label('final_revenue'),
+        func.sum(RoomPricing.inventory_count_snap).label('rooms'),
+        func.sum(occupied_expr).label('occupied'),
+        func.count(RoomPricing.id).label('total_days'),
+        func.sum(cast(RoomPricing.is_override, Integer)).label('override_count')
+    ).where(
+        RoomPricing.hotel_id == hotel_id,
+        RoomPricing.date >= start_date,
+        RoomPricing.date <= end_date
+    )
     if room_type_id:
-        room_types_query = room_types_query.filter(RoomType.id == room_type_id)
-    
-    room_types = room_types_query.all()
-    if not room_types:
-        raise HTTPException(
-            status_code=404,
-            detail=f"No room types found for hotel ID {hotel_id}"
-        )
-    
-    # Get room type IDs
-    room_type_ids = [rt.id for rt in room_types]
-    
-    # Build query for pricing data
-    query = db.query(
+        totals_stmt = totals_stmt.where(RoomPricing.room_type_id == room_type_id)
+
+    totals_rows = db.execute(totals_stmt.group_by(RoomPricing.room_type_id)).all()
+
+    # Fetch the per-day rows for the daily breakdown
+    daily_stmt = select(
         RoomPricing.date,
         RoomPricing.room_type_id,
         RoomPricing.suggested_price,
         RoomPricing.final_price,
         RoomPricing.is_override,
-        RoomPricing.forecasted_occupancy
-    ).filter(
-        RoomPricing.room_type_id.in_(room_type_ids),
+        RoomPricing.forecasted_occupancy,
+        occupied_expr.label('occupied_rooms'),
+        (occupied_expr * RoomPricing.final_price).label('revenue')
+    ).where(
+        RoomPricing.hotel_id == hotel_id,
         RoomPricing.date >= start_date,
         RoomPricing.date <= end_date
     )
-    
-    pricing_data = query.all()
-    
-    # Process data for analytics
+    if room_type_id:
+        daily_stmt = daily_stmt.where(RoomPricing.room_type_id == room_type_id)
+
+    # Compute the per-day derived fields as vectorized column operations
+    daily_df = pd.read_sql(daily_stmt.order_by(RoomPricing.date), db.bind)
+
+    daily_columns = [
+        "date", "suggested_price", "final_price", "is_override", "occupancy",
+        "occupied_rooms", "suggested_revenue", "final_revenue",
+        "revenue_difference", "revenue_difference_percentage"
+    ]
+
+    if daily_df.empty:
+        daily_grouped = {}
+    else:
+        daily_df['occupied_rooms'] = daily_df['occupied_rooms'].fillna(0).astype(int)
+        daily_df['suggested_revenue'] = (daily_df['occupied_rooms'] * daily_df['suggested_price']).round(2)
+        daily_df['final_revenue'] = daily_df['revenue'].fillna(0).round(2)
+        daily_df['revenue_difference'] = (daily_df['final_revenue'] - daily_df['suggested_revenue']).round(2)
+        daily_df['revenue_difference_percentage'] = np.where(
+            daily_df['suggested_revenue'] > 0,
+            (daily_df['final_revenue'] - daily_df['suggested_revenue']) / daily_df['suggested_revenue'] * 100,
+            0
+        ).round(2)
+        daily_df['occupancy'] = daily_df['forecasted_occupancy'].round(4)
+        daily_df['date'] = daily_df['date'].map(lambda d: d.isoformat())
+
+        daily_grouped = {
+            rt_id: group[daily_columns].to_dict(orient='records')
+            for rt_id, group in daily_df.groupby('room_type_id')
+        }
+
+    # Build analytics for each room type from the aggregated totals
     analytics_data = []
-    room_type_dict = {rt.id: rt for rt in room_types}
-    
-    # Group data by room type
-    room_type_grouped_data = {}
-    for item in pricing_data:
-        if item.room_type_id not in room_type_grouped_data:
-            room_type_grouped_data[item.room_type_id] = []
-        
-        room_type_grouped_data[item.room_type_id].append(item)
-    
-    # Calculate analytics for each room type
-    for rt_id, items in room_type_grouped_data.items():
-        room_type = room_type_dict[rt_id]
-        
-        total_suggested_revenue = 0
-        total_final_revenue = 0
-        total_rooms = 0
-        total_occupied = 0
-        override_count = 0
-        daily_data = []
-        
-        for item in items:
-            inventory = room_type.inventory_count
-            occupancy = item.forecasted_occupancy
-            occupied_rooms = round(inventory * occupancy)
-            
-            suggested_revenue = occupied_rooms * item.suggested_price
-            final_revenue = occupied_rooms * item.final_price
-            
-            total_suggested_revenue += suggested_revenue
-            total_final_revenue += final_revenue
-            total_rooms += inventory
-            total_occupied += occupied_rooms
-            
-            if item.is_override:
-                override_count += 1
-            
-            # Add daily data
-            daily_data.append({
-                "date": item.date.isoformat(),
-                "suggested_price": round(item.suggested_price, 2),
-                "final_price": round(item.final_price, 2),
-                "is_override": item.is_override,
-                "occupancy": round(occupancy, 4),
-                "occupied_rooms": occupied_rooms,
-                "suggested_revenue": round(suggested_revenue, 2),
-                "final_revenue": round(final_revenue, 2),
-                "revenue_difference": round(final_revenue - suggested_revenue, 2),
-                "revenue_difference_percentage": round((final_revenue - suggested_revenue) / suggested_revenue * 100 if suggested_revenue > 0 else 0, 2)
-            })
-        
+
+    for row in totals_rows:
+        daily_data = daily_grouped.get(row.room_type_id, [])
+
+        total_suggested_revenue = float(row.suggested_revenue or 0)
+        total_final_revenue = float(row.final_revenue or 0)
+        total_days = int(row.total_days or 0)
+        override_count = int(row.override_count or 0)
+
         # Calculate overall metrics
         revenue_difference = total_final_revenue - total_suggested_revenue
         revenue_difference_percentage = (revenue_difference / total_suggested_revenue * 100) if total_suggested_revenue > 0 else 0
-        override_percentage = (override_count / len(items) * 100) if items else 0
-        
-        # Sort daily data by date
-        daily_data.sort(key=lambda x: x["date"])
-        
-        # Add to analytics data
+        override_percentage = (override_count / total_days * 100) if total_days else 0
+
+        # Add to analytics data; the revenue sums arrive from the DB
+        # already rounded to 2 decimals
         analytics_data.append({
-            "room_type_id": rt_id,
-            "room_type_name": room_type.name,
-            "total_suggested_revenue": round(total_suggested_revenue, 2),
-            "total_final_revenue": round(total_final_revenue, 2),
+            "room_type_id": row.room_type_id,
+            "room_type_name": room_type_names.get(row.room_type_id),
+            "total_suggested_revenue": total_suggested_revenue,
+            "total_final_revenue": total_final_revenue,
             "revenue_difference": round(revenue_difference, 2),
             "revenue_difference_percentage": round(revenue_difference_percentage, 2),
-            "total_days": len(items),
+            "total_days": total_days,
             "override_count": override_count,
             "override_percentage": round(override_percentage, 2),
             "daily_data": daily_data
         })
-    
-    return {
+
+    response = {
         "hotel_id": hotel_id,
         "start_date": start_date.isoformat(),
         "end_date": end_date.isoformat(),
         "analytics": analytics_data
     }
+    cache_set(cache_key, response, analytics_ttl(end_date))
+    return response
 
 
 @router.get("/export/{hotel_id}")
@@ -591,94 +414,71 @@ def export_analytics_data(
     """
     Export analytics data for a hotel in a format suitable for CSV export or BI tools.
     """
-    # Check if hotel exists
-    hotel = db.query(Hotel).filter(Hotel.id == hotel_id).first()
-    if not hotel:
-        raise HTTPException(
-            status_code=404,
-            detail=f"Hotel with ID {hotel_id} not found"
-        )
-    
-    # Set default date range if not provided
-    if not end_date:
-        end_date = datetime.now().date()
-    
-    if not start_date:
-        # Default to 30 days before end_date
-        start_date = end_date - timedelta(days=30)
-    
-    # Build query for room types
-    room_types_query = db.query(RoomType).filter(RoomType.hotel_id == hotel_id)
-    if room_type_id:
-        room_types_query = room_types_query.filter(RoomType.id == room_type_id)
-    
-    room_types = room_types_query.all()
-    if not room_types:
-        raise HTTPException(
-            status_code=404,
-            detail=f"No room types found for hotel ID {hotel_id}"
-        )
-    
-    # Get room type IDs
-    room_type_ids = [rt.id for rt in room_types]
-    room_type_dict = {rt.id: rt for rt in room_types}
-    
-    # Build query for pricing data
-    query = db.query(
+    # The export streams in bounded batches, so long ranges are fine here
+    start_date, end_date = _default_date_range(start_date, end_date, max_days=None)
+    _assert_hotel(db, hotel_id)
+    _get_room_types(db, hotel_id, room_type_id)
+
+    # Build query for pricing data, joined with the room type columns the
+    # export needs so everything comes back in one SELECT
+    stmt = select(
         RoomPricing.date,
         RoomPricing.room_type_id,
         RoomPricing.suggested_price,
         RoomPricing.final_price,
         RoomPricing.is_override,
         RoomPricing.forecasted_demand,
-        RoomPricing.forecasted_occupancy
-    ).filter(
-        RoomPricing.room_type_id.in_(room_type_ids),
+        RoomPricing.forecasted_occupancy,
+        RoomType.name.label('room_type_name'),
+        RoomType.base_price,
+        RoomType.variable_cost,
+        RoomType.inventory_count
+    ).join_from(
+        RoomPricing, RoomType, RoomType.id == RoomPricing.room_type_id
+    ).where(
+        RoomType.hotel_id == hotel_id,
         RoomPricing.date >= start_date,
         RoomPricing.date <= end_date
-    ).order_by(RoomPricing.date, RoomPricing.room_type_id)
-    
-    pricing_data = query.all()
-    
-    # Prepare export data
-    export_data = []
-    
-    for item in pricing_data:
-        room_type = room_type_dict[item.room_type_id]
-        inventory = room_type.inventory_count
-        occupancy = item.forecasted_occupancy
-        occupied_rooms = round(inventory * occupancy)
-        revenue = occupied_rooms * item.final_price
-        variable_cost = occupied_rooms * room_type.variable_cost
-        contribution = revenue - variable_cost
-        contribution_margin = contribution / revenue if revenue > 0 else 0
-        
-        export_item = {
-            "date": item.date.isoformat(),
-            "room_type_id": item.room_type_id,
-            "room_type_name": room_type.name,
-            "base_price": room_type.base_price,
-            "variable_cost": room_type.variable_cost,
-            "inventory": inventory,
-            "suggested_price": item.suggested_price,
-            "final_price": item.final_price,
-            "is_override": item.is_override,
-            "forecasted_demand": item.forecasted_demand,
-            "forecasted_occupancy": occupancy,
-            "occupied_rooms": occupied_rooms,
-            "revenue": revenue,
-            "total_variable_cost": variable_cost,
-            "contribution": contribution,
-            "contribution_margin": contribution_margin
-        }
-        
-        export_data.append(export_item)
-    
-    return {
-        "hotel_id": hotel_id,
-        "hotel_name": hotel.name,
-        "start_date": start_date.isoformat(),
-        "end_date": end_date.isoformat(),
-        "data_type": data_type,
-        "export_data": export_data
-    }
+    )
+    if room_type_id:
+        stmt = stmt.where(RoomPricing.room_type_id == room_type_id)
+
+    stmt = stmt.order_by(RoomPricing.date, RoomPricing.room_type_id)
+
+    export_columns = [
+        "date", "room_type_id", "room_type_name", "base_price",
+        "variable_cost", "inventory", "suggested_price", "final_price",
+        "is_override", "forecasted_demand", "forecasted_occupancy",
+        "occupied_rooms", "revenue", "total_variable_cost",
+        "contribution", "contribution_margin"
+    ]
+
+    def generate_csv():
+        yield ','.join(export_columns) + '\n'
+
+        # Stream the rows in bounded batches, computing the derived fields
+        # as vectorized column operations per batch
+        for df in pd.read_sql(stmt, db.bind, chunksize=1000):
+            occupied, revenue, variable_cost_total, contribution = _revenue_kernel(
+                df['inventory_count'].to_numpy(),
+                df['forecasted_occupancy'].to_numpy(),
+                df['final_price'].to_numpy(),
+                df['variable_cost'].to_numpy()
+            )
+            df['occupied_rooms'] = occupied
+            df['revenue'] = revenue
+            df['total_variable_cost'] = variable_cost_total
+            df['contribution'] = contribution
+            df['contribution_margin'] = np.where(revenue > 0, contribution / revenue, 0)
+            df['date'] = df['date'].map(lambda d: d.isoformat())
+            df = df.rename(columns={'inventory_count': 'inventory'})
+
+            yield df[export_columns].to_csv(index=False, header=False)
+
+    filename = f"analytics_{data_type}_{hotel_id}_{start_date.isoformat()}_{end_date.isoformat()}.csv"
+
+    return StreamingResponse(
+        generate_csv(),
+        media_type="text/csv",
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
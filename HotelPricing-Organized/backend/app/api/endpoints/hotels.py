@@ -1,14 +1,32 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import bindparam, lambda_stmt, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session, selectinload
 
+from app.api.deps import apply_etag
+from app.core.cache import cache_get, cache_set, invalidate_namespace
+from app.core.config import settings
 from app.db.session import get_db
+from app.db.views import hotel_summary_view, refresh_hotel_summary_view
 from app.models.hotel import Hotel
-from app.models.hotel import RoomType
-from app.schemas.hotel import HotelCreate, HotelUpdate, HotelResponse, HotelDetailResponse
+from app.schemas.hotel import (
+    HotelCreate, HotelUpdate, HotelResponse, HotelDetailResponse,
+    HotelSummaryResponse
+)
 
 router = APIRouter()
 
+# Statement cached by lambda identity so SQLAlchemy skips re-building and
+# re-compiling the identical query shape on every request
+_HOTEL_DETAIL = lambda_stmt(
+    lambda: select(Hotel)
+    .options(selectinload(Hotel.room_types))
+    .where(Hotel.id == bindparam("id"))
+)
+
 
 @router.post("/", response_model=HotelResponse)
 def create_hotel(
@@ -18,34 +36,26 @@ def create_hotel(
     """
     Create a new hotel.
     """
-    # Check if hotel with same name already exists
-    existing_hotel = db.query(Hotel).filter(Hotel.name == hotel_in.name).first()
-    if existing_hotel:
+    # Single atomic INSERT; the uq_hotels_name constraint handles the
+    # duplicate check without a preliminary SELECT or TOCTOU race
+    stmt = (
+        pg_insert(Hotel)
+        .values(**hotel_in.dict())
+        .on_conflict_do_nothing(index_elements=["name"])
+        .returning(Hotel)
+    )
+    db_hotel = db.scalars(stmt).one_or_none()
+    if db_hotel is None:
+        db.rollback()
         raise HTTPException(
             status_code=400,
             detail=f"Hotel with name '{hotel_in.name}' already exists"
         )
-    
-    # Create new hotel
-    db_hotel = Hotel(
-        name=hotel_in.name,
-        address=hotel_in.address,
-        city=hotel_in.city,
-        state=hotel_in.state,
-        country=hotel_in.country,
-        zip_code=hotel_in.zip_code,
-        currency=hotel_in.currency,
-        timezone=hotel_in.timezone,
-        logo_url=hotel_in.logo_url,
-        primary_color=hotel_in.primary_color,
-        secondary_color=hotel_in.secondary_color,
-        monthly_fixed_costs=hotel_in.monthly_fixed_costs
-    )
-    
-    db.add(db_hotel)
+
     db.commit()
-    db.refresh(db_hotel)
-    
+    refresh_hotel_summary_view(db.get_bind())
+    invalidate_namespace("hotels")
+
     return db_hotel
 
 
@@ -59,55 +69,80 @@ def get_hotels(
     """
     Get all hotels, with optional filtering.
     """
+    # Hotel metadata changes rarely; serve repeat listings from the cache
+    cache_key = f"hotels:list:{skip}:{limit}:{is_active}"
+    cached = cache_get(cache_key)
+    if cached is not None:
+        return ORJSONResponse(content=cached)
+
     query = db.query(Hotel)
     
     if is_active is not None:
         query = query.filter(Hotel.is_active == is_active)
     
     hotels = query.offset(skip).limit(limit).all()
-    return hotels
+
+    # Pre-encoded payload: returning a Response skips the per-field
+    # response_model re-validation of DB-sourced data
+    response = jsonable_encoder([HotelResponse.from_orm(h) for h in hotels])
+    cache_set(cache_key, response, settings.METADATA_CACHE_TTL)
+    return ORJSONResponse(content=response)
+
+
+@router.get("/summary", response_model=List[HotelSummaryResponse])
+def get_hotels_summary(
+    is_active: Optional[bool] = True,
+    db: Session = Depends(get_db)
+):
+    """
+    Get the narrow hotel list projection (name, location, room-type count).
+
+    Served from the hotel_summary materialized view, so list UIs avoid
+    pulling full hotel rows and counting room types per hotel.
+    """
+    cache_key = f"hotels:summary:{is_active}"
+    cached = cache_get(cache_key)
+    if cached is not None:
+        return ORJSONResponse(content=cached)
+
+    hs = hotel_summary_view.c
+    stmt = select(hs.id, hs.name, hs.city, hs.country, hs.is_active, hs.room_type_count)
+    if is_active is not None:
+        stmt = stmt.where(hs.is_active == is_active)
+
+    rows = db.execute(stmt.order_by(hs.name)).mappings().all()
+
+    response = [dict(row) for row in rows]
+    cache_set(cache_key, response, settings.METADATA_CACHE_TTL)
+    return ORJSONResponse(content=response)
 
 
 @router.get("/{hotel_id}", response_model=HotelDetailResponse)
 def get_hotel(
     hotel_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db)
 ):
     """
     Get detailed information about a specific hotel.
     """
-    hotel = db.query(Hotel).filter(Hotel.id == hotel_id).first()
+    # Eager-load the room types in the same round trip as the hotel
+    hotel = db.execute(_HOTEL_DETAIL, {"id": hotel_id}).scalars().first()
     if not hotel:
         raise HTTPException(
             status_code=404,
             detail=f"Hotel with ID {hotel_id} not found"
         )
-    
-    # Get room types for this hotel
-    room_types = db.query(RoomType).filter(RoomType.hotel_id == hotel_id).all()
-    
-    # Create response with hotel and room types
-    response = HotelDetailResponse(
-        id=hotel.id,
-        name=hotel.name,
-        address=hotel.address,
-        city=hotel.city,
-        state=hotel.state,
-        country=hotel.country,
-        zip_code=hotel.zip_code,
-        currency=hotel.currency,
-        timezone=hotel.timezone,
-        logo_url=hotel.logo_url,
-        primary_color=hotel.primary_color,
-        secondary_color=hotel.secondary_color,
-        monthly_fixed_costs=hotel.monthly_fixed_costs,
-        is_active=hotel.is_active,
-        created_at=hotel.created_at,
-        updated_at=hotel.updated_at,
-        room_types=room_types
-    )
-    
-    return response
+
+    # Polling clients get a 304 when the hotel row is unchanged
+    not_modified = apply_etag(request, response, hotel.updated_at)
+    if not_modified is not None:
+        return not_modified
+
+    # response_model coerces via orm_mode, including the eager-loaded
+    # room_types collection
+    return hotel
 
 
 @router.put("/{hotel_id}", response_model=HotelResponse)
@@ -119,20 +154,31 @@ def update_hotel(
     """
     Update a hotel's information.
     """
+    payload = hotel_in.dict(exclude_unset=True)
+
+    if payload:
+        # Single UPDATE round trip; no prior SELECT or ORM hydration
+        rows = db.query(Hotel).filter(Hotel.id == hotel_id).update(
+            payload, synchronize_session=False
+        )
+        if not rows:
+            db.rollback()
+            raise HTTPException(
+                status_code=404,
+                detail=f"Hotel with ID {hotel_id} not found"
+            )
+        db.commit()
+        refresh_hotel_summary_view(db.get_bind())
+        invalidate_namespace("hotels")
+
+    # One SELECT for the response body
     hotel = db.query(Hotel).filter(Hotel.id == hotel_id).first()
     if not hotel:
         raise HTTPException(
             status_code=404,
             detail=f"Hotel with ID {hotel_id} not found"
         )
-    
-    # Update hotel attributes
-    for field, value in hotel_in.dict(exclude_unset=True).items():
-        setattr(hotel, field, value)
-    
-    db.commit()
-    db.refresh(hotel)
-    
+
     return hotel
 
 
@@ -155,5 +201,7 @@ def delete_hotel(
     hotel.is_active = False
     db.commit()
     db.refresh(hotel)
-    
+    refresh_hotel_summary_view(db.get_bind())
+    invalidate_namespace("hotels")
+
     return hotel
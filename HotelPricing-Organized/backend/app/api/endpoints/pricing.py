@@ -1,8 +1,15 @@
 from typing import List, Optional
 from datetime import datetime, date, timedelta
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import bindparam, exists, lambda_stmt, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session, selectinload
 
+from app.api.deps import apply_etag
+from app.core.cache import cache_get, cache_set, invalidate_namespace
+from app.core.config import settings
 from app.db.session import get_db
 from app.models.hotel import Hotel, RoomType, RoomPricing, PricingRule
 from app.schemas.pricing import (
@@ -15,6 +22,15 @@ from app.services.pricing import DynamicPricingEngine
 
 router = APIRouter()
 
+# Statements cached by lambda identity so SQLAlchemy skips re-building and
+# re-compiling the identical query shapes on every request
+_HOTEL_EXISTS = lambda_stmt(
+    lambda: select(exists().where(Hotel.id == bindparam("id")))
+)
+_RULE_BY_ID = lambda_stmt(
+    lambda: select(PricingRule).where(PricingRule.id == bindparam("id"))
+)
+
 
 # Pricing Rules Endpoints
 
@@ -26,41 +42,32 @@ def create_pricing_rule(
     """
     Create a new pricing rule.
     """
-    # Check if hotel exists
-    hotel = db.query(Hotel).filter(Hotel.id == rule_in.hotel_id).first()
-    if not hotel:
+    # Check if hotel exists without hydrating the row
+    if not db.execute(_HOTEL_EXISTS, {"id": rule_in.hotel_id}).scalar():
         raise HTTPException(
             status_code=404,
             detail=f"Hotel with ID {rule_in.hotel_id} not found"
         )
     
-    # Check if rule with same name already exists for this hotel
-    existing_rule = db.query(PricingRule).filter(
-        PricingRule.hotel_id == rule_in.hotel_id,
-        PricingRule.name == rule_in.name
-    ).first()
-    
-    if existing_rule:
+    # Single atomic INSERT; the (hotel_id, name) unique constraint handles
+    # the duplicate check without a preliminary SELECT or TOCTOU race
+    stmt = (
+        pg_insert(PricingRule)
+        .values(**rule_in.dict())
+        .on_conflict_do_nothing(index_elements=["hotel_id", "name"])
+        .returning(PricingRule)
+    )
+    db_rule = db.scalars(stmt).one_or_none()
+    if db_rule is None:
+        db.rollback()
         raise HTTPException(
             status_code=400,
             detail=f"Pricing rule '{rule_in.name}' already exists for this hotel"
         )
-    
-    # Create new pricing rule
-    db_rule = PricingRule(
-        hotel_id=rule_in.hotel_id,
-        name=rule_in.name,
-        description=rule_in.description,
-        min_price_multiplier=rule_in.min_price_multiplier,
-        max_price_multiplier=rule_in.max_price_multiplier,
-        low_demand_threshold=rule_in.low_demand_threshold,
-        high_demand_threshold=rule_in.high_demand_threshold
-    )
-    
-    db.add(db_rule)
+
     db.commit()
-    db.refresh(db_rule)
-    
+    invalidate_namespace("pricing_rules")
+
     return db_rule
 
 
@@ -75,6 +82,12 @@ def get_pricing_rules(
     """
     Get all pricing rules, with optional filtering by hotel.
     """
+    # Rule metadata changes rarely; serve repeat listings from the cache
+    cache_key = f"pricing_rules:list:{hotel_id}:{skip}:{limit}:{is_active}"
+    cached = cache_get(cache_key)
+    if cached is not None:
+        return ORJSONResponse(content=cached)
+
     query = db.query(PricingRule)
     
     if hotel_id is not None:
@@ -84,24 +97,36 @@ def get_pricing_rules(
         query = query.filter(PricingRule.is_active == is_active)
     
     rules = query.offset(skip).limit(limit).all()
-    return rules
+
+    # Pre-encoded payload: returning a Response skips the per-field
+    # response_model re-validation of DB-sourced data
+    response = jsonable_encoder([PricingRuleResponse.from_orm(r) for r in rules])
+    cache_set(cache_key, response, settings.METADATA_CACHE_TTL)
+    return ORJSONResponse(content=response)
 
 
 @router.get("/rules/{rule_id}", response_model=PricingRuleResponse)
 def get_pricing_rule(
     rule_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db)
 ):
     """
     Get detailed information about a specific pricing rule.
     """
-    rule = db.query(PricingRule).filter(PricingRule.id == rule_id).first()
+    rule = db.execute(_RULE_BY_ID, {"id": rule_id}).scalars().first()
     if not rule:
         raise HTTPException(
             status_code=404,
             detail=f"Pricing rule with ID {rule_id} not found"
         )
-    
+
+    # Polling clients get a 304 when the row is unchanged
+    not_modified = apply_etag(request, response, rule.updated_at)
+    if not_modified is not None:
+        return not_modified
+
     return rule
 
 
@@ -114,20 +139,30 @@ def update_pricing_rule(
     """
     Update a pricing rule's information.
     """
+    payload = rule_in.dict(exclude_unset=True)
+
+    if payload:
+        # Single UPDATE round trip; no prior SELECT or ORM hydration
+        rows = db.query(PricingRule).filter(PricingRule.id == rule_id).update(
+            payload, synchronize_session=False
+        )
+        if not rows:
+            db.rollback()
+            raise HTTPException(
+                status_code=404,
+                detail=f"Pricing rule with ID {rule_id} not found"
+            )
+        db.commit()
+        invalidate_namespace("pricing_rules")
+
+    # One SELECT for the response body
     rule = db.query(PricingRule).filter(PricingRule.id == rule_id).first()
     if not rule:
         raise HTTPException(
             status_code=404,
             detail=f"Pricing rule with ID {rule_id} not found"
         )
-    
-    # Update rule attributes
-    for field, value in rule_in.dict(exclude_unset=True).items():
-        setattr(rule, field, value)
-    
-    db.commit()
-    db.refresh(rule)
-    
+
     return rule
 
 
@@ -150,7 +185,8 @@ def delete_pricing_rule(
     rule.is_active = False
     db.commit()
     db.refresh(rule)
-    
+    invalidate_namespace("pricing_rules")
+
     return rule
 
 
@@ -168,6 +204,14 @@ def get_room_pricing(
     """
     Get room pricing data with optional filtering.
     """
+    # Invalidated by the RoomPricing write listener in app.core.cache
+    # (the bulk save path, which writes through Core, invalidates the
+    # namespace explicitly in the service)
+    cache_key = f"room_pricing:list:{room_type_id}:{start_date}:{end_date}:{skip}:{limit}"
+    cached = cache_get(cache_key)
+    if cached is not None:
+        return ORJSONResponse(content=cached)
+
     query = db.query(RoomPricing)
     
     if room_type_id is not None:
@@ -180,7 +224,10 @@ def get_room_pricing(
         query = query.filter(RoomPricing.date <= end_date)
     
     pricing_data = query.offset(skip).limit(limit).all()
-    return pricing_data
+
+    response = jsonable_encoder([RoomPricingResponse.from_orm(p) for p in pricing_data])
+    cache_set(cache_key, response, settings.METADATA_CACHE_TTL)
+    return ORJSONResponse(content=response)
 
 
 @router.post("/override", response_model=dict)
@@ -191,9 +238,12 @@ def override_price(
     """
     Apply a manual price override for a specific room on a specific date.
     """
-    # Check if room type exists
-    room_type = db.query(RoomType).filter(RoomType.id == override_in.room_type_id).first()
-    if not room_type:
+    # Resolve the room type's hotel in one single-column lookup; doubles
+    # as the existence check
+    hotel_id = db.query(RoomType.hotel_id).filter(
+        RoomType.id == override_in.room_type_id
+    ).scalar()
+    if hotel_id is None:
         raise HTTPException(
             status_code=404,
             detail=f"Room type with ID {override_in.room_type_id} not found"
@@ -209,11 +259,16 @@ def override_price(
         price=override_in.price,
         notes=override_in.notes
     )
-    
+
+    # Overrides must show up in cached recommendations immediately
+    invalidate_namespace(f"recommendations:{hotel_id}")
+
     return result
 
 
-@router.get("/recommendations/{hotel_id}", response_model=HotelPricingRecommendations)
+# response_model=None: the payload is internally produced and serialized
+# directly; the schema stays in the OpenAPI docs via `responses`
+@router.get("/recommendations/{hotel_id}", response_model=None, responses={200: {"model": HotelPricingRecommendations}})
 def get_pricing_recommendations(
     hotel_id: int,
     start_date: Optional[date] = None,
@@ -224,8 +279,12 @@ def get_pricing_recommendations(
     """
     Generate pricing recommendations for all room types in a hotel.
     """
-    # Check if hotel exists
-    hotel = db.query(Hotel).filter(Hotel.id == hotel_id).first()
+    # Load the hotel with its room types and rules up front; the engine
+    # walks both per forecast day, so lazy loading would N+1
+    hotel = db.query(Hotel).options(
+        selectinload(Hotel.room_types),
+        selectinload(Hotel.pricing_rules)
+    ).filter(Hotel.id == hotel_id).first()
     if not hotel:
         raise HTTPException(
             status_code=404,
@@ -235,7 +294,14 @@ def get_pricing_recommendations(
     # Use current date if start_date not provided
     if start_date is None:
         start_date = datetime.now().date()
-    
+
+    # Recommendations run the demand forecaster, so memoize them for the
+    # forecast refresh window; overrides and saves invalidate the namespace
+    cache_key = f"recommendations:{hotel_id}:{start_date.isoformat()}:{days}:{room_type_id}"
+    cached = cache_get(cache_key)
+    if cached is not None:
+        return ORJSONResponse(content=cached)
+
     # Initialize pricing engine
     pricing_engine = DynamicPricingEngine(db)
     
@@ -244,10 +310,20 @@ def get_pricing_recommendations(
         hotel_id=hotel_id,
         start_date=start_date,
         days=days,
-        room_type_id=room_type_id
+        room_type_id=room_type_id,
+        hotel=hotel
     )
-    
-    return recommendations
+
+    # Internally generated payload: serialize the encoded dict directly
+    # instead of re-validating it against the response_model
+    response = jsonable_encoder(recommendations)
+    cache_set(
+        cache_key,
+        response,
+        settings.FORECAST_UPDATE_FREQUENCY_HOURS * 3600
+    )
+
+    return ORJSONResponse(content=response)
 
 
 @router.post("/save-recommendations/{hotel_id}")
@@ -259,9 +335,8 @@ def save_pricing_recommendations(
     """
     Save pricing recommendations to the database.
     """
-    # Check if hotel exists
-    hotel = db.query(Hotel).filter(Hotel.id == hotel_id).first()
-    if not hotel:
+    # Check if hotel exists without hydrating the row
+    if not db.query(Hotel.id).filter(Hotel.id == hotel_id).scalar():
         raise HTTPException(
             status_code=404,
             detail=f"Hotel with ID {hotel_id} not found"
@@ -275,11 +350,15 @@ def save_pricing_recommendations(
         hotel_id=hotel_id,
         recommendations=recommendations
     )
-    
+
+    invalidate_namespace(f"recommendations:{hotel_id}")
+
     return {"status": "success", "message": "Pricing recommendations saved successfully"}
 
 
-@router.post("/elasticity", response_model=PriceElasticitySimulation)
+# response_model=None: the payload is internally produced and serialized
+# directly; the schema stays in the OpenAPI docs via `responses`
+@router.post("/elasticity", response_model=None, responses={200: {"model": PriceElasticitySimulation}})
 def simulate_price_elasticity(
     elasticity_in: PriceElasticityRequest,
     db: Session = Depends(get_db)
@@ -287,20 +366,28 @@ def simulate_price_elasticity(
     """
     Simulate price elasticity by predicting demand at different price points.
     """
-    # Check if room type exists
-    room_type = db.query(RoomType).filter(RoomType.id == elasticity_in.room_type_id).first()
-    if not room_type:
+    # Resolve the room type's hotel in one single-column lookup; doubles
+    # as the existence check
+    hotel_id = db.query(RoomType.hotel_id).filter(
+        RoomType.id == elasticity_in.room_type_id
+    ).scalar()
+    if hotel_id is None:
         raise HTTPException(
             status_code=404,
             detail=f"Room type with ID {elasticity_in.room_type_id} not found"
         )
-    
+
+    # Elasticity runs the demand model per price point; memoize for the
+    # forecast refresh window
+    price_key = ",".join(str(p) for p in (elasticity_in.price_range or []))
+    cache_key = f"elasticity:{hotel_id}:{elasticity_in.room_type_id}:{elasticity_in.date.isoformat()}:{price_key}"
+    cached = cache_get(cache_key)
+    if cached is not None:
+        return ORJSONResponse(content=cached)
+
     # Initialize pricing engine
     pricing_engine = DynamicPricingEngine(db)
-    
-    # Get hotel ID
-    hotel_id = room_type.hotel_id
-    
+
     # Simulate elasticity
     result = pricing_engine.forecaster.simulate_price_elasticity(
         hotel_id=hotel_id,
@@ -308,5 +395,12 @@ def simulate_price_elasticity(
         date=elasticity_in.date,
         price_range=elasticity_in.price_range
     )
-    
-    return result
+
+    response = jsonable_encoder(result)
+    cache_set(
+        cache_key,
+        response,
+        settings.FORECAST_UPDATE_FREQUENCY_HOURS * 3600
+    )
+
+    return ORJSONResponse(content=response)
@@ -1,13 +1,30 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import bindparam, exists, lambda_stmt, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
+from app.api.deps import apply_etag
+from app.core.cache import cache_get, cache_set, invalidate_namespace
+from app.core.config import settings
 from app.db.session import get_db
-from app.models.hotel import RoomType, Hotel
+from app.db.views import refresh_hotel_summary_view
+from app.models.hotel import RoomType, Hotel, RoomPricing
 from app.schemas.hotel import RoomTypeCreate, RoomTypeUpdate, RoomTypeResponse
 
 router = APIRouter()
 
+# Statements cached by lambda identity so SQLAlchemy skips re-building and
+# re-compiling the identical query shapes on every request
+_HOTEL_EXISTS = lambda_stmt(
+    lambda: select(exists().where(Hotel.id == bindparam("id")))
+)
+_ROOM_TYPE_BY_ID = lambda_stmt(
+    lambda: select(RoomType).where(RoomType.id == bindparam("id"))
+)
+
 
 @router.post("/", response_model=RoomTypeResponse)
 def create_room_type(
@@ -17,43 +34,35 @@ def create_room_type(
     """
     Create a new room type.
     """
-    # Check if hotel exists
-    hotel = db.query(Hotel).filter(Hotel.id == room_type_in.hotel_id).first()
-    if not hotel:
+    # Check if hotel exists without hydrating the row
+    if not db.execute(_HOTEL_EXISTS, {"id": room_type_in.hotel_id}).scalar():
         raise HTTPException(
             status_code=404,
             detail=f"Hotel with ID {room_type_in.hotel_id} not found"
         )
     
-    # Check if room type with same name already exists for this hotel
-    existing_room_type = db.query(RoomType).filter(
-        RoomType.hotel_id == room_type_in.hotel_id,
-        RoomType.name == room_type_in.name
-    ).first()
-    
-    if existing_room_type:
+    # Single atomic INSERT; the (hotel_id, name) unique constraint handles
+    # the duplicate check without a preliminary SELECT or TOCTOU race
+    stmt = (
+        pg_insert(RoomType)
+        .values(**room_type_in.dict())
+        .on_conflict_do_nothing(index_elements=["hotel_id", "name"])
+        .returning(RoomType)
+    )
+    db_room_type = db.scalars(stmt).one_or_none()
+    if db_room_type is None:
+        db.rollback()
         raise HTTPException(
             status_code=400,
             detail=f"Room type '{room_type_in.name}' already exists for this hotel"
         )
-    
-    # Create new room type
-    db_room_type = RoomType(
-        hotel_id=room_type_in.hotel_id,
-        name=room_type_in.name,
-        description=room_type_in.description,
-        base_price=room_type_in.base_price,
-        variable_cost=room_type_in.variable_cost,
-        inventory_count=room_type_in.inventory_count,
-        max_occupancy=room_type_in.max_occupancy,
-        amenities=room_type_in.amenities,
-        image_url=room_type_in.image_url
-    )
-    
-    db.add(db_room_type)
+
     db.commit()
-    db.refresh(db_room_type)
-    
+    refresh_hotel_summary_view(db.get_bind())
+    invalidate_namespace("room_types")
+    # The cached /hotels/summary responses embed room_type_count
+    invalidate_namespace("hotels")
+
     return db_room_type
 
 
@@ -68,6 +77,12 @@ def get_room_types(
     """
     Get all room types, with optional filtering by hotel.
     """
+    # Room-type metadata changes rarely; serve repeat listings from the cache
+    cache_key = f"room_types:list:{hotel_id}:{skip}:{limit}:{is_active}"
+    cached = cache_get(cache_key)
+    if cached is not None:
+        return ORJSONResponse(content=cached)
+
     query = db.query(RoomType)
     
     if hotel_id is not None:
@@ -77,24 +92,36 @@ def get_room_types(
         query = query.filter(RoomType.is_active == is_active)
     
     room_types = query.offset(skip).limit(limit).all()
-    return room_types
+
+    # Pre-encoded payload: returning a Response skips the per-field
+    # response_model re-validation of DB-sourced data
+    response = jsonable_encoder([RoomTypeResponse.from_orm(rt) for rt in room_types])
+    cache_set(cache_key, response, settings.METADATA_CACHE_TTL)
+    return ORJSONResponse(content=response)
 
 
 @router.get("/{room_type_id}", response_model=RoomTypeResponse)
 def get_room_type(
     room_type_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db)
 ):
     """
     Get detailed information about a specific room type.
     """
-    room_type = db.query(RoomType).filter(RoomType.id == room_type_id).first()
+    room_type = db.execute(_ROOM_TYPE_BY_ID, {"id": room_type_id}).scalars().first()
     if not room_type:
         raise HTTPException(
             status_code=404,
             detail=f"Room type with ID {room_type_id} not found"
         )
-    
+
+    # Polling clients get a 304 when the row is unchanged
+    not_modified = apply_etag(request, response, room_type.updated_at)
+    if not_modified is not None:
+        return not_modified
+
     return room_type
 
 
@@ -107,20 +134,46 @@ def update_room_type(
     """
     Update a room type's information.
     """
+    payload = room_type_in.dict(exclude_unset=True)
+
+    if payload:
+        # Single UPDATE round trip; no prior SELECT or ORM hydration
+        rows = db.query(RoomType).filter(RoomType.id == room_type_id).update(
+            payload, synchronize_session=False
+        )
+        if not rows:
+            db.rollback()
+            raise HTTPException(
+                status_code=404,
+                detail=f"Room type with ID {room_type_id} not found"
+            )
+
+        # The bulk UPDATE bypasses the ORM after_update listener, so keep
+        # the denormalized pricing snapshot columns in sync explicitly
+        snap = {}
+        if "inventory_count" in payload:
+            snap["inventory_count_snap"] = payload["inventory_count"]
+        if "variable_cost" in payload:
+            snap["variable_cost_snap"] = payload["variable_cost"]
+        if snap:
+            db.query(RoomPricing).filter(
+                RoomPricing.room_type_id == room_type_id
+            ).update(snap, synchronize_session=False)
+
+        db.commit()
+        refresh_hotel_summary_view(db.get_bind())
+        invalidate_namespace("room_types")
+        # The cached /hotels/summary responses embed room_type_count
+        invalidate_namespace("hotels")
+
+    # One SELECT for the response body
     room_type = db.query(RoomType).filter(RoomType.id == room_type_id).first()
     if not room_type:
         raise HTTPException(
             status_code=404,
             detail=f"Room type with ID {room_type_id} not found"
         )
-    
-    # Update room type attributes
-    for field, value in room_type_in.dict(exclude_unset=True).items():
-        setattr(room_type, field, value)
-    
-    db.commit()
-    db.refresh(room_type)
-    
+
     return room_type
 
 
@@ -143,5 +196,9 @@ def delete_room_type(
     room_type.is_active = False
     db.commit()
     db.refresh(room_type)
-    
+    refresh_hotel_summary_view(db.get_bind())
+    invalidate_namespace("room_types")
+    # The cached /hotels/summary responses embed room_type_count
+    invalidate_namespace("hotels")
+
     return room_type
@@ -0,0 +1,117 @@
+import json
+import logging
+import time
+from datetime import date, datetime
+from typing import Any, Optional
+
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.models.hotel import RoomPricing
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+# Redis client, created lazily from settings.REDIS_URL. When Redis is not
+# configured or unreachable we fall back to a per-process TTL dict, which
+# still absorbs dashboard refresh traffic on a single worker.
+_redis_client = None
+_redis_failed = False
+_local_cache = {}  # key -> (expires_at, value)
+
+# Cap on the fallback dict: keys embed client-controlled parameters
+# (pagination offsets, arbitrary date ranges), so without a bound the
+# per-process cache would grow with every distinct query shape
+_LOCAL_CACHE_MAX_ENTRIES = 1024
+
+
+def _get_redis():
+    global _redis_client, _redis_failed
+    if redis is None or not settings.REDIS_URL or _redis_failed:
+        return None
+    if _redis_client is None:
+        try:
+            _redis_client = redis.Redis.from_url(settings.REDIS_URL)
+            _redis_client.ping()
+        except Exception as e:
+            logger.warning(f"Redis unavailable, using in-process cache: {e}")
+            _redis_client = None
+            _redis_failed = True
+    return _redis_client
+
+
+def analytics_ttl(end_date: date) -> int:
+    """TTL for analytics entries: historical ranges never change, so they
+    can be cached much longer than ranges that include today."""
+    if end_date < datetime.now().date():
+        return settings.ANALYTICS_CACHE_HISTORICAL_TTL
+    return settings.ANALYTICS_CACHE_TTL
+
+
+def cache_get(key: str) -> Optional[Any]:
+    """Get a cached JSON-serializable value, or None on miss."""
+    client = _get_redis()
+    if client is not None:
+        try:
+            raw = client.get(key)
+            return json.loads(raw) if raw is not None else None
+        except Exception as e:
+            logger.warning(f"Redis get failed for {key}: {e}")
+            return None
+
+    entry = _local_cache.get(key)
+    if entry is None:
+        return None
+    expires_at, value = entry
+    if expires_at <= time.time():
+        _local_cache.pop(key, None)
+        return None
+    return value
+
+
+def cache_set(key: str, value: Any, ttl: int) -> None:
+    """Cache a JSON-serializable value for ttl seconds."""
+    client = _get_redis()
+    if client is not None:
+        try:
+            client.setex(key, ttl, json.dumps(value))
+            return
+        except Exception as e:
+            logger.warning(f"Redis set failed for {key}: {e}")
+
+    now = time.time()
+    if len(_local_cache) >= _LOCAL_CACHE_MAX_ENTRIES:
+        # Sweep expired entries first; if the cache is still full, evict
+        # the entries closest to expiry
+        for stale in [k for k, (expires_at, _) in _local_cache.items() if expires_at <= now]:
+            _local_cache.pop(stale, None)
+        while len(_local_cache) >= _LOCAL_CACHE_MAX_ENTRIES:
+            soonest = min(_local_cache, key=lambda k: _local_cache[k][0])
+            _local_cache.pop(soonest, None)
+    _local_cache[key] = (now + ttl, value)
+
+
+def invalidate_namespace(prefix: str) -> None:
+    """Drop every cached entry whose key starts with '{prefix}:'."""
+    client = _get_redis()
+    if client is not None:
+        try:
+            for key in client.scan_iter(f"{prefix}:*"):
+                client.delete(key)
+        except Exception as e:
+            logger.warning(f"Redis invalidation failed for {prefix}: {e}")
+
+    for key in [k for k in _local_cache if k.startswith(f"{prefix}:")]:
+        _local_cache.pop(key, None)
+
+
+@event.listens_for(RoomPricing, "after_insert")
+@event.listens_for(RoomPricing, "after_update")
+def _invalidate_on_pricing_write(mapper, connection, target) -> None:
+    """Pricing writes change every analytics response, so drop them all."""
+    invalidate_namespace("analytics")
+    invalidate_namespace("room_pricing")
@@ -1,13 +1,19 @@
+import os
 import secrets
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Union
 
-from pydantic import AnyHttpUrl, BaseSettings, PostgresDsn, validator
+from pydantic import AnyHttpUrl, BaseSettings, Field, PostgresDsn, validator
 
 
 class Settings(BaseSettings):
     PROJECT_NAME: str = "Hotel Dynamic Pricing Engine"
     API_V1_STR: str = "/api/v1"
-    SECRET_KEY: str = secrets.token_urlsafe(32)
+    # Generated lazily so importing the class never mints a key; set
+    # SECRET_KEY in the environment for a value stable across restarts
+    SECRET_KEY: str = Field(
+        default_factory=lambda: os.environ.get("SECRET_KEY") or secrets.token_urlsafe(32)
+    )
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8  # 8 days
     
     # CORS
@@ -27,6 +33,10 @@ class Settings(BaseSettings):
     POSTGRES_PASSWORD: str = "postgres"
     POSTGRES_DB: str = "hotel_pricing"
     SQLALCHEMY_DATABASE_URI: Optional[PostgresDsn] = None
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 40
+    DB_POOL_RECYCLE: int = 1800  # seconds; keeps pooled connections fresh
+    SYNC_WORKER_THREADS: int = 100  # anyio threadpool size for sync endpoints
 
     @validator("SQLALCHEMY_DATABASE_URI", pre=True)
     def assemble_db_connection(cls, v: Optional[str], values: Dict[str, Any]) -> Any:
@@ -45,9 +55,17 @@ class Settings(BaseSettings):
     AUTH0_API_AUDIENCE: str = ""
     AUTH0_ALGORITHMS: List[str] = ["RS256"]
     
+    # Caching
+    REDIS_URL: str = ""  # e.g. redis://localhost:6379/0; empty = in-process cache
+    ANALYTICS_CACHE_TTL: int = 60  # seconds, for ranges that include today
+    ANALYTICS_CACHE_HISTORICAL_TTL: int = 60 * 60 * 24  # ranges ending before today
+    METADATA_CACHE_TTL: int = 300  # hotel/room-type/rule list endpoints
+
     # Forecasting
     DEFAULT_FORECAST_DAYS: int = 90
     FORECAST_UPDATE_FREQUENCY_HOURS: int = 24
+    MODEL_CACHE_DIR: str = "model_cache"  # fitted-model snapshots (joblib)
+    USE_PROPHET: bool = False  # fit/predict Prophet instead of the seasonality tables
     
     # Pricing
     MIN_CONTRIBUTION_MARGIN: float = 0.0  # Minimum contribution margin (0 = at cost)
@@ -58,4 +76,15 @@ class Settings(BaseSettings):
         env_file = ".env"
 
 
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Build the settings once per process.
+
+    Env parsing and validation (DSN assembly, CORS parsing) are not free;
+    the cache makes repeated calls — e.g. as a FastAPI dependency — a dict
+    lookup.
+    """
+    return Settings()
+
+
+settings = get_settings()
@@ -0,0 +1,92 @@
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# Idempotent schema upgrades for databases created before the denormalized
+# pricing columns existed. create_all only creates missing tables, so new
+# columns and their backfill have to be applied explicitly.
+_UPGRADES = [
+    "ALTER TABLE room_pricing ADD COLUMN IF NOT EXISTS hotel_id INTEGER REFERENCES hotels(id)",
+    "ALTER TABLE room_pricing ADD COLUMN IF NOT EXISTS inventory_count_snap INTEGER",
+    "ALTER TABLE room_pricing ADD COLUMN IF NOT EXISTS variable_cost_snap DOUBLE PRECISION",
+    """
+    UPDATE room_pricing rp
+    SET hotel_id = rt.hotel_id,
+        inventory_count_snap = rt.inventory_count,
+        variable_cost_snap = rt.variable_cost
+    FROM room_types rt
+    WHERE rt.id = rp.room_type_id AND rp.hotel_id IS NULL
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_room_pricing_hotel_date_rt ON room_pricing (hotel_id, date, room_type_id)",
+    # Price columns moved from double precision to NUMERIC(10,2) so the DB
+    # hands back already-rounded money values. The materialized view has to
+    # be dropped first because it depends on these columns; create_views()
+    # recreates it right after the upgrades run.
+    """
+    DO $$
+    BEGIN
+        IF EXISTS (
+            SELECT 1 FROM information_schema.columns
+            WHERE table_name = 'room_pricing'
+              AND column_name = 'final_price'
+              AND data_type = 'double precision'
+        ) THEN
+            DROP MATERIALIZED VIEW IF EXISTS mv_pricing_daily;
+            ALTER TABLE room_types
+                ALTER COLUMN base_price TYPE NUMERIC(10, 2),
+                ALTER COLUMN variable_cost TYPE NUMERIC(10, 2);
+            ALTER TABLE room_pricing
+                ALTER COLUMN suggested_price TYPE NUMERIC(10, 2),
+                ALTER COLUMN final_price TYPE NUMERIC(10, 2),
+                ALTER COLUMN variable_cost_snap TYPE NUMERIC(10, 2);
+        END IF;
+    END $$
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_room_pricing_rt_date
+    ON room_pricing (room_type_id, date)
+    INCLUDE (final_price, suggested_price, forecasted_occupancy, is_override)
+    """,
+    "ANALYZE room_pricing",
+    # Unique indexes backing the INSERT .. ON CONFLICT create endpoints
+    "CREATE UNIQUE INDEX IF NOT EXISTS uq_hotels_name ON hotels (name)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS uq_room_types_hotel_name ON room_types (hotel_id, name)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS uq_pricing_rules_hotel_name ON pricing_rules (hotel_id, name)",
+    # Composite indexes for the hotel_id + is_active listing filters
+    "CREATE INDEX IF NOT EXISTS ix_room_types_hotel_active ON room_types (hotel_id, is_active)",
+    "CREATE INDEX IF NOT EXISTS ix_pricing_rules_hotel_active ON pricing_rules (hotel_id, is_active)",
+    # One pricing row per room type per day; rebuild the covering index as
+    # unique on databases that created it before the constraint was added
+    """
+    DO $$
+    BEGIN
+        IF EXISTS (
+            SELECT 1
+            FROM pg_index i
+            JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE c.relname = 'ix_room_pricing_rt_date' AND NOT i.indisunique
+        ) THEN
+            DROP INDEX ix_room_pricing_rt_date;
+            CREATE UNIQUE INDEX ix_room_pricing_rt_date
+            ON room_pricing (room_type_id, date)
+            INCLUDE (final_price, suggested_price, forecasted_occupancy, is_override);
+        END IF;
+    END $$
+    """,
+]
+
+
+def run_schema_upgrades(engine: Engine) -> None:
+    """Apply the idempotent upgrades; safe to run on every startup."""
+    with engine.connect() as conn:
+        for statement in _UPGRADES:
+            try:
+                conn.execute(text(statement))
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                logger.error(f"Schema upgrade failed: {e}")
+                raise
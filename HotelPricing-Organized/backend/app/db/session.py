@@ -1,15 +1,39 @@
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 
 from app.core.config import settings
 
-engine = create_engine(settings.SQLALCHEMY_DATABASE_URI, pool_pre_ping=True)
+# Sized for many short-lived queries per request; pool_recycle keeps
+# connections fresh behind PgBouncer in transaction-pooling mode
+engine = create_engine(
+    settings.SQLALCHEMY_DATABASE_URI,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_pre_ping=True,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 def get_db():
     """Dependency for getting DB session."""
     db = SessionLocal()
+    # Request-scoped cache for repeated primary-key entity lookups
+    db.info["entity_cache"] = {}
     try:
         yield db
     finally:
         db.close()
+
+
+def get_entity_cached(db: Session, model, entity_id: int):
+    """Fetch an entity by primary key through the session's request cache.
+
+    Endpoints and the pricing engine repeatedly look up the same Hotel or
+    RoomType within one request; after the first query the rest are a dict
+    hit instead of a round trip.
+    """
+    cache = db.info.setdefault("entity_cache", {})
+    key = (model, entity_id)
+    if key not in cache:
+        cache[key] = db.query(model).filter(model.id == entity_id).first()
+    return cache[key]
@@ -0,0 +1,155 @@
+import logging
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import (
+    Table, Column, MetaData, Integer, Float, Boolean, DateTime, Numeric,
+    String, text
+)
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# Pre-joined RoomPricing x RoomType rows with the per-row arithmetic
+# (occupied rooms, revenue, variable cost, contribution) already computed,
+# so analytics queries are a single scan with no join.
+PRICING_VIEW_NAME = "mv_pricing_daily"
+
+_CREATE_PRICING_VIEW = f"""
+CREATE MATERIALIZED VIEW IF NOT EXISTS {PRICING_VIEW_NAME} AS
+SELECT
+    rp.id AS id,
+    rp.date AS date,
+    rp.room_type_id AS room_type_id,
+    rt.hotel_id AS hotel_id,
+    rt.name AS room_type_name,
+    rt.inventory_count AS inventory_count,
+    rt.variable_cost AS variable_cost,
+    rt.base_price AS base_price,
+    rp.suggested_price AS suggested_price,
+    rp.final_price AS final_price,
+    rp.is_override AS is_override,
+    rp.forecasted_demand AS forecasted_demand,
+    rp.forecasted_occupancy AS forecasted_occupancy,
+    ROUND(rt.inventory_count * rp.forecasted_occupancy) AS occupied_rooms,
+    ROUND((ROUND(rt.inventory_count * rp.forecasted_occupancy) * rp.final_price)::numeric, 2) AS revenue,
+    ROUND((ROUND(rt.inventory_count * rp.forecasted_occupancy) * rt.variable_cost)::numeric, 2) AS variable_cost_total,
+    ROUND((ROUND(rt.inventory_count * rp.forecasted_occupancy) * (rp.final_price - rt.variable_cost))::numeric, 2) AS contribution
+FROM room_pricing rp
+JOIN room_types rt ON rt.id = rp.room_type_id
+"""
+
+# Unique index is required for REFRESH MATERIALIZED VIEW CONCURRENTLY
+_CREATE_PRICING_VIEW_INDEXES = [
+    f"CREATE UNIQUE INDEX IF NOT EXISTS ux_{PRICING_VIEW_NAME}_id ON {PRICING_VIEW_NAME} (id)",
+    f"CREATE INDEX IF NOT EXISTS ix_{PRICING_VIEW_NAME}_hotel_date ON {PRICING_VIEW_NAME} (hotel_id, date)",
+]
+
+# Narrow read model for hotel list UIs: just the columns the list shows,
+# plus the room-type count that would otherwise be an N+1
+HOTEL_SUMMARY_VIEW_NAME = "hotel_summary"
+
+_CREATE_HOTEL_SUMMARY_VIEW = f"""
+CREATE MATERIALIZED VIEW IF NOT EXISTS {HOTEL_SUMMARY_VIEW_NAME} AS
+SELECT
+    h.id AS id,
+    h.name AS name,
+    h.city AS city,
+    h.country AS country,
+    h.is_active AS is_active,
+    COUNT(rt.id) AS room_type_count
+FROM hotels h
+LEFT JOIN room_types rt ON rt.hotel_id = h.id AND rt.is_active = TRUE
+GROUP BY h.id
+"""
+
+_CREATE_HOTEL_SUMMARY_VIEW_INDEXES = [
+    f"CREATE UNIQUE INDEX IF NOT EXISTS ux_{HOTEL_SUMMARY_VIEW_NAME}_id ON {HOTEL_SUMMARY_VIEW_NAME} (id)",
+]
+
+# Core table for querying the materialized view
+pricing_view = Table(
+    PRICING_VIEW_NAME,
+    MetaData(),
+    Column("id", Integer, primary_key=True),
+    Column("date", DateTime(timezone=True)),
+    Column("room_type_id", Integer),
+    Column("hotel_id", Integer),
+    Column("room_type_name", String(100)),
+    Column("inventory_count", Integer),
+    Column("variable_cost", Numeric(10, 2, asdecimal=False)),
+    Column("base_price", Numeric(10, 2, asdecimal=False)),
+    Column("suggested_price", Numeric(10, 2, asdecimal=False)),
+    Column("final_price", Numeric(10, 2, asdecimal=False)),
+    Column("is_override", Boolean),
+    Column("forecasted_demand", Float),
+    Column("forecasted_occupancy", Float),
+    Column("occupied_rooms", Float),
+    Column("revenue", Numeric(asdecimal=False)),
+    Column("variable_cost_total", Numeric(asdecimal=False)),
+    Column("contribution", Numeric(asdecimal=False)),
+)
+
+# Core table for querying the hotel summary view
+hotel_summary_view = Table(
+    HOTEL_SUMMARY_VIEW_NAME,
+    MetaData(),
+    Column("id", Integer, primary_key=True),
+    Column("name", String(255)),
+    Column("city", String(100)),
+    Column("country", String(100)),
+    Column("is_active", Boolean),
+    Column("room_type_count", Integer),
+)
+
+# Timestamp of the last successful refresh in this process, exposed to
+# clients as staleness metadata on analytics responses.
+_last_refreshed_at: Optional[datetime] = None
+
+
+def create_views(engine: Engine) -> None:
+    """Create the materialized views and their indexes if they don't exist."""
+    global _last_refreshed_at
+    with engine.connect() as conn:
+        conn.execute(text(_CREATE_PRICING_VIEW))
+        for index_sql in _CREATE_PRICING_VIEW_INDEXES:
+            conn.execute(text(index_sql))
+        conn.execute(text(_CREATE_HOTEL_SUMMARY_VIEW))
+        for index_sql in _CREATE_HOTEL_SUMMARY_VIEW_INDEXES:
+            conn.execute(text(index_sql))
+        conn.commit()
+    if _last_refreshed_at is None:
+        _last_refreshed_at = datetime.now()
+
+
+def refresh_pricing_view(engine: Engine) -> None:
+    """Refresh the pricing view after RoomPricing writes.
+
+    Uses CONCURRENTLY so readers are not blocked; this cannot run inside
+    a transaction block, hence the autocommit connection.
+    """
+    global _last_refreshed_at
+    try:
+        with engine.connect() as conn:
+            conn.execution_options(isolation_level="AUTOCOMMIT").execute(
+                text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {PRICING_VIEW_NAME}")
+            )
+        _last_refreshed_at = datetime.now()
+    except Exception as e:
+        logger.error(f"Error refreshing {PRICING_VIEW_NAME}: {e}")
+
+
+def refresh_hotel_summary_view(engine: Engine) -> None:
+    """Refresh the hotel summary view after hotel/room-type writes."""
+    try:
+        with engine.connect() as conn:
+            conn.execution_options(isolation_level="AUTOCOMMIT").execute(
+                text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {HOTEL_SUMMARY_VIEW_NAME}")
+            )
+    except Exception as e:
+        logger.error(f"Error refreshing {HOTEL_SUMMARY_VIEW_NAME}: {e}")
+
+
+def get_last_refreshed() -> Optional[str]:
+    """Return the ISO timestamp of the last refresh, if known."""
+    return _last_refreshed_at.isoformat() if _last_refreshed_at else None
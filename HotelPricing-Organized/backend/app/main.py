@@ -1,14 +1,16 @@
-from fastapi import FastAPI, Depends
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.api.routes import api_router
 from app.core.config import settings
-from app.db.session import engine
-from app.db.base import Base
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+# Schema setup (create_all, idempotent upgrades, materialized views) is
+# deliberately NOT run at import time: every worker would repeat the DDL
+# and introspection round-trips on each deploy. It lives in
+# app.db.init_db, which run.py executes once before serving (or run
+# `python -m app.db.init_db` as a pre-deploy step).
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -17,6 +19,7 @@ app = FastAPI(
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
 )
 
 # Set up CORS middleware
@@ -28,25 +31,48 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large JSON payloads (forecast/analytics responses are highly
+# repetitive); small responses skip compression via minimum_size
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
+
+@app.on_event("startup")
+async def raise_threadpool_limit():
+    """Widen the worker pool that runs the sync (def) endpoints.
+
+    The handlers stay sync because the service layer is built on the sync
+    Session (pandas read_sql, ORM event listeners, CPU-bound forecasting),
+    so anyio's default 40-thread cap is the effective concurrency ceiling
+    for I/O-bound requests; raise it to match the DB pool headroom.
+    """
+    from anyio import to_thread
+
+    to_thread.current_default_thread_limiter().total_tokens = settings.SYNC_WORKER_THREADS
+
 @app.get("/")
 async def root():
-    return JSONResponse(
-        content={
-            "message": "Welcome to the Hotel Dynamic Pricing Engine API",
-            "docs": "/docs",
-            "redoc": "/redoc",
-        }
-    )
+    return {
+        "message": "Welcome to the Hotel Dynamic Pricing Engine API",
+        "docs": "/docs",
+        "redoc": "/redoc",
+    }
 
 @app.get("/health")
 async def health_check():
-    return JSONResponse(
-        content={"status": "healthy"}
-    )
+    return {"status": "healthy"}
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
+    # uvloop/httptools replace the selector event loop and the pure-Python
+    # HTTP parser with C implementations
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        reload=True,
+    )
@@ -1,4 +1,7 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, ForeignKey, Text
+from sqlalchemy import (
+    Column, Integer, String, Float, Boolean, DateTime, ForeignKey, Text,
+    Index, Numeric, UniqueConstraint, event, select, update
+)
 from sqlalchemy.orm import relationship
 
 from app.db.base import Base, TimestampMixin
@@ -7,6 +10,9 @@ from app.db.base import Base, TimestampMixin
 class Hotel(Base, TimestampMixin):
     """Hotel model representing a property in the system."""
     __tablename__ = "hotels"
+    __table_args__ = (
+        UniqueConstraint("name", name="uq_hotels_name"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False)
@@ -26,7 +32,7 @@ class Hotel(Base, TimestampMixin):
     monthly_fixed_costs = Column(Float, nullable=False, default=0.0)
     
     # Relationships
-    rooms = relationship("RoomType", back_populates="hotel", cascade="all, delete-orphan")
+    room_types = relationship("RoomType", back_populates="hotel", cascade="all, delete-orphan")
     pricing_rules = relationship("PricingRule", back_populates="hotel", cascade="all, delete-orphan")
     
     def __repr__(self):
@@ -36,13 +42,18 @@ class Hotel(Base, TimestampMixin):
 class RoomType(Base, TimestampMixin):
     """Room type model representing a category of rooms in a hotel."""
     __tablename__ = "room_types"
+    __table_args__ = (
+        UniqueConstraint("hotel_id", "name", name="uq_room_types_hotel_name"),
+        # Every room-type listing filters on these two columns
+        Index("ix_room_types_hotel_active", "hotel_id", "is_active"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     hotel_id = Column(Integer, ForeignKey("hotels.id"), nullable=False)
     name = Column(String(100), nullable=False)
     description = Column(Text, nullable=True)
-    base_price = Column(Float, nullable=False)  # Standard/rack rate
-    variable_cost = Column(Float, nullable=False)  # Cost per occupied room
+    base_price = Column(Numeric(10, 2, asdecimal=False), nullable=False)  # Standard/rack rate
+    variable_cost = Column(Numeric(10, 2, asdecimal=False), nullable=False)  # Cost per occupied room
     inventory_count = Column(Integer, nullable=False)  # Number of rooms of this type
     max_occupancy = Column(Integer, nullable=False, default=2)
     amenities = Column(Text, nullable=True)  # JSON string of amenities
@@ -50,7 +61,7 @@ class RoomType(Base, TimestampMixin):
     is_active = Column(Boolean, default=True)
     
     # Relationships
-    hotel = relationship("Hotel", back_populates="rooms")
+    hotel = relationship("Hotel", back_populates="room_types")
     pricing_history = relationship("RoomPricing", back_populates="room_type", cascade="all, delete-orphan")
     
     def __repr__(self):
@@ -60,20 +71,41 @@ class RoomType(Base, TimestampMixin):
 class RoomPricing(Base, TimestampMixin):
     """Daily pricing for a specific room type."""
     __tablename__ = "room_pricing"
+    __table_args__ = (
+        Index("ix_room_pricing_hotel_date_rt", "hotel_id", "date", "room_type_id"),
+        # Covering index for the per-room-type date-range queries, so they
+        # resolve as index-only scans without touching the heap; unique
+        # because there is one pricing row per room type per day
+        Index(
+            "ix_room_pricing_rt_date",
+            "room_type_id",
+            "date",
+            unique=True,
+            postgresql_include=[
+                "final_price", "suggested_price", "forecasted_occupancy", "is_override"
+            ],
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     room_type_id = Column(Integer, ForeignKey("room_types.id"), nullable=False)
     date = Column(DateTime(timezone=True), nullable=False)
-    suggested_price = Column(Float, nullable=False)
-    final_price = Column(Float, nullable=False)  # After manual override if any
+    suggested_price = Column(Numeric(10, 2, asdecimal=False), nullable=False)
+    final_price = Column(Numeric(10, 2, asdecimal=False), nullable=False)  # After manual override if any
     is_override = Column(Boolean, default=False)
     override_notes = Column(Text, nullable=True)
     forecasted_demand = Column(Float, nullable=True)  # 0-1 probability
     forecasted_occupancy = Column(Float, nullable=True)  # 0-1 probability
-    
+
+    # Denormalized from Hotel/RoomType so analytics can scan this table
+    # without a join; kept in sync by the event listeners below
+    hotel_id = Column(Integer, ForeignKey("hotels.id"), nullable=True)
+    inventory_count_snap = Column(Integer, nullable=True)
+    variable_cost_snap = Column(Numeric(10, 2, asdecimal=False), nullable=True)
+
     # Relationships
     room_type = relationship("RoomType", back_populates="pricing_history")
-    
+
     def __repr__(self):
         return f"<RoomPricing for {self.room_type.name} on {self.date}>"
 
@@ -81,6 +113,11 @@ class RoomPricing(Base, TimestampMixin):
 class PricingRule(Base, TimestampMixin):
     """Business rules for dynamic pricing."""
     __tablename__ = "pricing_rules"
+    __table_args__ = (
+        UniqueConstraint("hotel_id", "name", name="uq_pricing_rules_hotel_name"),
+        # Active-rule lookups filter on these two columns
+        Index("ix_pricing_rules_hotel_active", "hotel_id", "is_active"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     hotel_id = Column(Integer, ForeignKey("hotels.id"), nullable=False)
@@ -94,6 +131,34 @@ class PricingRule(Base, TimestampMixin):
     
     # Relationships
     hotel = relationship("Hotel", back_populates="pricing_rules")
-    
+
     def __repr__(self):
         return f"<PricingRule {self.name} for {self.hotel.name}>"
+
+
+@event.listens_for(RoomPricing, "before_insert")
+def _snapshot_room_type_columns(mapper, connection, target):
+    """Fill the denormalized columns from the room type on insert."""
+    if target.hotel_id is None or target.inventory_count_snap is None:
+        row = connection.execute(
+            select(RoomType.hotel_id, RoomType.inventory_count, RoomType.variable_cost)
+            .where(RoomType.id == target.room_type_id)
+        ).first()
+        if row:
+            target.hotel_id = row.hotel_id
+            target.inventory_count_snap = row.inventory_count
+            target.variable_cost_snap = row.variable_cost
+
+
+@event.listens_for(RoomType, "after_update")
+def _propagate_room_type_columns(mapper, connection, target):
+    """Propagate inventory/cost changes to the denormalized pricing rows."""
+    connection.execute(
+        update(RoomPricing)
+        .where(RoomPricing.room_type_id == target.id)
+        .values(
+            hotel_id=target.hotel_id,
+            inventory_count_snap=target.inventory_count,
+            variable_cost_snap=target.variable_cost,
+        )
+    )
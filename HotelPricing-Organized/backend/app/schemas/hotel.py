@@ -97,3 +97,16 @@ class RoomTypeResponse(RoomTypeBase):
 # Schema for detailed hotel response with room types
 class HotelDetailResponse(HotelResponse):
     room_types: List[RoomTypeResponse] = []
+
+
+# Narrow schema backing the hotel_summary read model
+class HotelSummaryResponse(BaseModel):
+    id: int
+    name: str
+    city: str
+    country: str
+    is_active: bool
+    room_type_count: int
+
+    class Config:
+        orm_mode = True
@@ -1,13 +1,64 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from types import SimpleNamespace
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 import pandas as pd
 import numpy as np
+from sqlalchemy import case, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
+from app.core.cache import invalidate_namespace
 from app.models.hotel import Hotel, RoomType, RoomPricing, PricingRule
+from app.db.session import get_entity_cached
+from app.db.views import refresh_pricing_view
 from app.services.forecasting import DemandForecaster
 from app.core.config import settings
 
+# Shared pool for fanning per-room-type forecasts across cores; the
+# XGBoost predict kernels release the GIL, so threads scale without the
+# pickling cost a process pool would add
+_forecast_pool = ThreadPoolExecutor(max_workers=os.cpu_count())
+
+# Fallback rule parameters for hotels without an active PricingRule; a
+# plain namespace read on the hot path, never persisted, so it skips the
+# ORM instrumentation cost of constructing a throwaway PricingRule row
+_DEFAULT_RULE = SimpleNamespace(
+    min_price_multiplier=0.5,
+    max_price_multiplier=2.0,
+    low_demand_threshold=0.3,
+    high_demand_threshold=0.7,
+)
+
+
+@lru_cache(maxsize=8192)
+def _price_math(
+    base_price: float,
+    variable_cost: float,
+    low_t: float,
+    high_t: float,
+    min_m: float,
+    max_m: float,
+    min_margin: float,
+    demand_q: float
+) -> tuple:
+    """Pure piecewise-linear price math for a single quantized demand value.
+
+    Memoized across requests: the inputs are all scalars, so rule edits
+    naturally miss the cache (the rule's parameters are part of the key)
+    and no invalidation hook is needed. Returns (multiplier, suggested).
+    """
+    if demand_q <= low_t:
+        multiplier = min_m + (1 - min_m) * (demand_q / low_t)
+    elif demand_q >= high_t:
+        multiplier = 1.0 + (max_m - 1.0) * (demand_q - high_t) / (1 - high_t)
+    else:
+        multiplier = 1.0
+    suggested = max(base_price * multiplier, variable_cost + min_margin)
+    return multiplier, suggested
+
 
 class DynamicPricingEngine:
     """
@@ -18,13 +69,19 @@ class DynamicPricingEngine:
     def __init__(self, db: Session):
         self.db = db
         self.forecaster = DemandForecaster(db)
+        # Active pricing rules memoized per hotel for the engine's lifetime
+        # (one request); rules don't change mid-batch
+        self._rule_cache: Dict[int, PricingRule] = {}
     
     def calculate_optimal_price(
         self,
         room_type_id: int,
         date: datetime,
         demand_probability: float,
-        override: Optional[Dict[str, Any]] = None
+        override: Optional[Dict[str, Any]] = None,
+        room_type: Optional[RoomType] = None,
+        hotel: Optional[Hotel] = None,
+        pricing_rule: Optional[PricingRule] = None
     ) -> Dict[str, Any]:
         """
         Calculate the optimal price for a room based on demand and costs.
@@ -34,66 +91,45 @@ class DynamicPricingEngine:
             date: Date to calculate price for
             demand_probability: Forecasted demand probability (0-1)
             override: Optional manual override data
+            room_type: Optional pre-loaded room type (skips the lookup)
+            hotel: Optional pre-loaded hotel (skips the lookup)
+            pricing_rule: Optional pre-loaded active rule (skips the lookup)
             
         Returns:
             Dictionary with pricing details
         """
-        # Get room type details
-        room_type = self.db.query(RoomType).filter(RoomType.id == room_type_id).first()
+        # Entity lookups run only when the caller didn't pass the objects
+        # in; batch callers hoist them so the hot path never hits the DB
+        if room_type is None:
+            room_type = get_entity_cached(self.db, RoomType, room_type_id)
         if not room_type:
             raise ValueError(f"Room type with ID {room_type_id} not found")
-        
-        # Get hotel details
-        hotel = self.db.query(Hotel).filter(Hotel.id == room_type.hotel_id).first()
+
+        if hotel is None:
+            hotel = get_entity_cached(self.db, Hotel, room_type.hotel_id)
         if not hotel:
             raise ValueError(f"Hotel with ID {room_type.hotel_id} not found")
-        
-        # Get pricing rules
-        pricing_rule = self.db.query(PricingRule).filter(
-            PricingRule.hotel_id == hotel.id,
-            PricingRule.is_active == True
-        ).first()
-        
-        if not pricing_rule:
-            # Create default pricing rule if none exists
-            pricing_rule = PricingRule(
-                hotel_id=hotel.id,
-                name="Default Rule",
-                description="System-generated default rule",
-                min_price_multiplier=0.5,
-                max_price_multiplier=2.0,
-                low_demand_threshold=0.3,
-                high_demand_threshold=0.7,
-                is_active=True
-            )
+
+        if pricing_rule is None:
+            pricing_rule = self._get_active_pricing_rule(hotel.id)
         
         # Calculate price based on demand
         base_price = room_type.base_price
         variable_cost = room_type.variable_cost
-        
-        # Determine price multiplier based on demand
-        if demand_probability <= pricing_rule.low_demand_threshold:
-            # Low demand - discount prices
-            # Linear scale from min_multiplier at 0 demand to 1.0 at low_threshold
-            demand_ratio = demand_probability / pricing_rule.low_demand_threshold
-            price_multiplier = pricing_rule.min_price_multiplier + (1 - pricing_rule.min_price_multiplier) * demand_ratio
-        elif demand_probability >= pricing_rule.high_demand_threshold:
-            # High demand - premium prices
-            # Linear scale from 1.0 at high_threshold to max_multiplier at 1.0 demand
-            demand_ratio = (demand_probability - pricing_rule.high_demand_threshold) / (1 - pricing_rule.high_demand_threshold)
-            price_multiplier = 1.0 + (pricing_rule.max_price_multiplier - 1.0) * demand_ratio
-        else:
-            # Normal demand - standard pricing
-            # Linear scale from 1.0 at low_threshold to 1.0 at high_threshold
-            price_multiplier = 1.0
-        
-        # Calculate suggested price
-        suggested_price = base_price * price_multiplier
-        
-        # Ensure price covers variable costs plus minimum contribution margin
-        min_price = variable_cost + settings.MIN_CONTRIBUTION_MARGIN
-        if suggested_price < min_price:
-            suggested_price = min_price
+
+        # Piecewise multiplier and floored price from the memoized pure
+        # core; demand is quantized to 3 decimals so repeated calls with
+        # near-identical probabilities hit the cache
+        price_multiplier, suggested_price = _price_math(
+            base_price,
+            variable_cost,
+            pricing_rule.low_demand_threshold,
+            pricing_rule.high_demand_threshold,
+            pricing_rule.min_price_multiplier,
+            pricing_rule.max_price_multiplier,
+            settings.MIN_CONTRIBUTION_MARGIN,
+            round(demand_probability, 3)
+        )
         
         # Apply override if provided
         is_override = False
@@ -136,75 +172,225 @@ class DynamicPricingEngine:
             'expected_contribution': round(expected_contribution, 2)
         }
     
-    def generate_pricing_recommendations(
+    def _get_active_pricing_rule(self, hotel_id: int) -> PricingRule:
+        """Fetch the hotel's active pricing rule, or a default if none.
+
+        Memoized per hotel on self._rule_cache so repeated single-day
+        calls within one request don't re-query the rule.
+        """
+        cached = self._rule_cache.get(hotel_id)
+        if cached is not None:
+            return cached
+        pricing_rule = self.db.query(PricingRule).filter(
+            PricingRule.hotel_id == hotel_id,
+            PricingRule.is_active == True
+        ).first()
+        if not pricing_rule:
+            # Shared read-only default if none exists (not persisted)
+            pricing_rule = _DEFAULT_RULE
+        self._rule_cache[hotel_id] = pricing_rule
+        return pricing_rule
+
+    def _price_batch(
+        self,
+        room_type: RoomType,
+        pricing_rule: PricingRule,
+        dates_iso: List[str],
+        demand: np.ndarray,
+        override_prices: np.ndarray,
+        override_mask: np.ndarray,
+        override_notes: List[Optional[str]]
+    ) -> List[Dict[str, Any]]:
+        """Vectorized calculate_optimal_price over a whole forecast horizon.
+
+        The per-day arithmetic (piecewise multiplier, cost floor, override
+        substitution, margins, expected revenue) runs as array operations
+        over the demand vector; the final loop only packs result dicts.
+        """
+        base_price = room_type.base_price
+        variable_cost = room_type.variable_cost
+        inventory_count = room_type.inventory_count
+
+        low_t = pricing_rule.low_demand_threshold
+        high_t = pricing_rule.high_demand_threshold
+
+        # Piecewise-linear multiplier: discount below the low-demand
+        # threshold, premium above the high one, 1.0 in between
+        multiplier = np.ones_like(demand)
+        multiplier = np.where(
+            demand <= low_t,
+            pricing_rule.min_price_multiplier
+            + (1 - pricing_rule.min_price_multiplier) * (demand / low_t),
+            multiplier
+        )
+        multiplier = np.where(
+            demand >= high_t,
+            1.0 + (pricing_rule.max_price_multiplier - 1.0) * (demand - high_t) / (1 - high_t),
+            multiplier
+        )
+
+        # Suggested price, floored at variable cost plus minimum margin
+        suggested = np.maximum(
+            base_price * multiplier,
+            variable_cost + settings.MIN_CONTRIBUTION_MARGIN
+        )
+        final = np.where(override_mask, override_prices, suggested)
+
+        contribution = final - variable_cost
+        # Branchless margin percentage: divide by a safe denominator
+        # everywhere, then mask the zero-price rows
+        safe_final = np.where(final > 0, final, 1.0)
+        contribution_pct = np.where(final > 0, (contribution / safe_final) * 100.0, 0.0)
+        expected_bookings = demand * inventory_count
+        expected_revenue = expected_bookings * final
+        expected_contribution = expected_bookings * contribution
+
+        # Materialize the whole horizon through a DataFrame: rounding is
+        # one vectorized pass and to_dict(orient='records') packs the
+        # output dicts without per-field Python round() calls
+        df = pd.DataFrame({
+            'date': dates_iso,
+            'room_type_id': room_type.id,
+            'room_type_name': room_type.name,
+            'base_price': base_price,
+            'variable_cost': variable_cost,
+            'demand_probability': demand,
+            'price_multiplier': multiplier,
+            'suggested_price': suggested,
+            'final_price': final,
+            'is_override': override_mask,
+            'override_notes': override_notes,
+            'contribution_margin': contribution,
+            'contribution_margin_percentage': contribution_pct,
+            'expected_occupancy': demand,
+            'expected_bookings': expected_bookings,
+            'expected_revenue': expected_revenue,
+            'expected_contribution': expected_contribution,
+        }).round({
+            'suggested_price': 2,
+            'final_price': 2,
+            'contribution_margin': 2,
+            'contribution_margin_percentage': 2,
+            'expected_occupancy': 4,
+            'expected_bookings': 2,
+            'expected_revenue': 2,
+            'expected_contribution': 2,
+        })
+        return df.to_dict(orient='records')
+
+    def iter_room_recommendations(
         self,
         hotel_id: int,
         start_date: datetime,
         days: int = 30,
-        room_type_id: Optional[int] = None
-    ) -> Dict[str, Any]:
-        """
-        Generate pricing recommendations for all room types in a hotel.
-        
-        Args:
-            hotel_id: ID of the hotel
-            start_date: Start date for recommendations
-            days: Number of days to generate recommendations for
-            room_type_id: Optional specific room type ID
-            
-        Returns:
-            Dictionary with pricing recommendations
+        room_type_id: Optional[int] = None,
+        hotel: Optional[Hotel] = None
+    ):
+        """Yield (room_type_id, recommendation dict) one room type at a time.
+
+        Generator form of the batch: callers that stream or post-process
+        per room type hold one room's chunk in memory instead of the
+        whole R x D payload. generate_pricing_recommendations wraps this
+        for callers that need the full dict.
         """
-        # Get room types
-        query = self.db.query(RoomType).filter(RoomType.hotel_id == hotel_id, RoomType.is_active == True)
-        if room_type_id:
-            query = query.filter(RoomType.id == room_type_id)
-        
-        room_types = query.all()
+        # Get room types, reusing the caller's eager-loaded hotel when given
+        if hotel is not None:
+            room_types = [
+                rt for rt in hotel.room_types
+                if rt.is_active and (room_type_id is None or rt.id == room_type_id)
+            ]
+            # Seed the request cache so the per-day price calculations hit
+            # the dict instead of re-querying these entities
+            cache = self.db.info.setdefault("entity_cache", {})
+            cache[(Hotel, hotel.id)] = hotel
+            for rt in hotel.room_types:
+                cache[(RoomType, rt.id)] = rt
+        else:
+            # Project only the columns the batch reads: lightweight Row
+            # tuples (attribute access preserved) instead of hydrating
+            # full instrumented ORM instances
+            query = self.db.query(
+                RoomType.id,
+                RoomType.name,
+                RoomType.base_price,
+                RoomType.variable_cost,
+                RoomType.inventory_count
+            ).filter(RoomType.hotel_id == hotel_id, RoomType.is_active == True)
+            if room_type_id:
+                query = query.filter(RoomType.id == room_type_id)
+
+            room_types = query.all()
         if not room_types:
             raise ValueError(f"No active room types found for hotel ID {hotel_id}")
         
-        # Generate recommendations for each room type
-        recommendations = {}
-        
-        for room_type in room_types:
-            # Get demand forecast
-            demand_forecast = self.forecaster.forecast_demand(
+        # Forecast all room types in parallel; base_price is passed from
+        # the already-loaded rows so the workers never touch the session
+        forecasts = list(_forecast_pool.map(
+            lambda rt: self.forecaster.forecast_demand(
                 hotel_id=hotel_id,
-                room_type_id=room_type.id,
+                room_type_id=rt.id,
                 start_date=start_date,
-                days=days
+                days=days,
+                base_price=rt.base_price
+            ),
+            room_types
+        ))
+
+        # One rule lookup covers the whole batch
+        pricing_rule = self._get_active_pricing_rule(hotel_id)
+
+        # Overrides are sparse, so one projected IN query fetches just the
+        # override rows and columns for every room type at once; after
+        # this the per-room loop below is pure array math with no DB
+        # access and no ORM hydration
+        # Keyed on the plain date: the column is timestamptz so psycopg2
+        # returns aware datetimes, while the horizon axis below is naive,
+        # and naive == aware is always False
+        override_map = {
+            (rt_id, row_date.date()): (final_price, notes)
+            for rt_id, row_date, final_price, notes in self.db.query(
+                RoomPricing.room_type_id,
+                RoomPricing.date,
+                RoomPricing.final_price,
+                RoomPricing.override_notes
+            ).filter(
+                RoomPricing.room_type_id.in_([rt.id for rt in room_types]),
+                RoomPricing.is_override == True,
+                RoomPricing.date >= start_date,
+                RoomPricing.date < start_date + timedelta(days=days)
             )
-            
-            # Calculate optimal prices
-            room_prices = []
-            for day_forecast in demand_forecast:
-                date = datetime.fromisoformat(day_forecast['date'])
-                
-                # Check if there's an existing override
-                existing_pricing = self.db.query(RoomPricing).filter(
-                    RoomPricing.room_type_id == room_type.id,
-                    RoomPricing.date == date
-                ).first()
-                
-                override = None
-                if existing_pricing and existing_pricing.is_override:
-                    override = {
-                        'price': existing_pricing.final_price,
-                        'notes': existing_pricing.override_notes
-                    }
-                
-                # Calculate optimal price
-                price_data = self.calculate_optimal_price(
-                    room_type_id=room_type.id,
-                    date=date,
-                    demand_probability=day_forecast['demand_probability'],
-                    override=override
-                )
-                
-                room_prices.append(price_data)
-            
-            recommendations[room_type.id] = {
+        }
+
+        # The forecast horizon is start_date + i days by construction, so
+        # the date axis is materialized once as a vector instead of
+        # re-parsing the ISO strings the forecaster emits for JSON; the
+        # ISO column and the native datetimes each come from one pass
+        date_index = pd.date_range(start_date, periods=days, freq='D')
+        dates = date_index.to_pydatetime()
+        dates_iso = date_index.strftime('%Y-%m-%d').tolist()
+
+        for room_type, demand_forecast in zip(room_types, forecasts):
+            demand = np.asarray(
+                [d['demand_probability'] for d in demand_forecast], dtype=np.float64
+            )
+
+            # Existing overrides become sparse arrays for the batch kernel
+            override_prices = np.zeros(demand.size)
+            override_mask = np.zeros(demand.size, dtype=bool)
+            override_notes: List[Optional[str]] = [None] * demand.size
+            for i, date in enumerate(dates):
+                hit = override_map.get((room_type.id, date.date()))
+                if hit is not None:
+                    override_mask[i] = True
+                    override_prices[i], override_notes[i] = hit
+
+            # Calculate optimal prices for the whole horizon at once
+            room_prices = self._price_batch(
+                room_type, pricing_rule, dates_iso, demand,
+                override_prices, override_mask, override_notes
+            )
+
+            yield room_type.id, {
                 'room_type_id': room_type.id,
                 'room_type_name': room_type.name,
                 'base_price': room_type.base_price,
@@ -212,7 +398,36 @@ class DynamicPricingEngine:
                 'inventory_count': room_type.inventory_count,
                 'prices': room_prices
             }
+
+    def generate_pricing_recommendations(
+        self,
+        hotel_id: int,
+        start_date: datetime,
+        days: int = 30,
+        room_type_id: Optional[int] = None,
+        hotel: Optional[Hotel] = None
+    ) -> Dict[str, Any]:
+        """
+        Generate pricing recommendations for all room types in a hotel.
         
+        Args:
+            hotel_id: ID of the hotel
+            start_date: Start date for recommendations
+            days: Number of days to generate recommendations for
+            room_type_id: Optional specific room type ID
+            hotel: Optional pre-loaded Hotel with room_types eager-loaded
+            
+        Returns:
+            Dictionary with pricing recommendations
+        """
+        recommendations = dict(self.iter_room_recommendations(
+            hotel_id=hotel_id,
+            start_date=start_date,
+            days=days,
+            room_type_id=room_type_id,
+            hotel=hotel
+        ))
+
         return {
             'hotel_id': hotel_id,
             'start_date': start_date.date().isoformat(),
@@ -233,38 +448,62 @@ class DynamicPricingEngine:
             hotel_id: ID of the hotel
             recommendations: Pricing recommendations dictionary
         """
+        # Every room type shares the same date axis, so it is parsed once
+        # here rather than once per row
+        start_date = datetime.fromisoformat(recommendations['start_date'])
+        date_axis = pd.date_range(
+            start_date, periods=recommendations['days'], freq='D'
+        ).to_pydatetime()
+
+        rows = []
         for room_type_id, room_data in recommendations['recommendations'].items():
-            for price_data in room_data['prices']:
-                date = datetime.fromisoformat(price_data['date'])
-                
-                # Check if pricing record already exists
-                existing = self.db.query(RoomPricing).filter(
-                    RoomPricing.room_type_id == room_type_id,
-                    RoomPricing.date == date
-                ).first()
-                
-                if existing:
-                    # Update existing record
-                    existing.suggested_price = price_data['suggested_price']
-                    if not existing.is_override:
-                        existing.final_price = price_data['final_price']
-                    existing.forecasted_demand = price_data['demand_probability']
-                    existing.forecasted_occupancy = price_data['expected_occupancy']
-                else:
-                    # Create new record
-                    new_pricing = RoomPricing(
-                        room_type_id=room_type_id,
-                        date=date,
-                        suggested_price=price_data['suggested_price'],
-                        final_price=price_data['final_price'],
-                        is_override=price_data['is_override'],
-                        override_notes=price_data['override_notes'],
-                        forecasted_demand=price_data['demand_probability'],
-                        forecasted_occupancy=price_data['expected_occupancy']
-                    )
-                    self.db.add(new_pricing)
-        
+            for date, price_data in zip(date_axis, room_data['prices']):
+                rows.append({
+                    'room_type_id': room_type_id,
+                    'date': date,
+                    'suggested_price': price_data['suggested_price'],
+                    'final_price': price_data['final_price'],
+                    'is_override': price_data['is_override'],
+                    'override_notes': price_data['override_notes'],
+                    'forecasted_demand': price_data['demand_probability'],
+                    'forecasted_occupancy': price_data['expected_occupancy'],
+                    # Denormalized columns normally filled by the ORM
+                    # before_insert listener, which Core inserts bypass
+                    'hotel_id': hotel_id,
+                    'inventory_count_snap': room_data['inventory_count'],
+                    'variable_cost_snap': room_data['variable_cost'],
+                })
+
+        if rows:
+            # One upsert statement for the whole batch, keyed on the unique
+            # (room_type_id, date) index; manually overridden rows keep
+            # their final_price and override metadata
+            stmt = pg_insert(RoomPricing).values(rows)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['room_type_id', 'date'],
+                set_={
+                    'suggested_price': stmt.excluded.suggested_price,
+                    'final_price': case(
+                        (RoomPricing.is_override, RoomPricing.final_price),
+                        else_=stmt.excluded.final_price,
+                    ),
+                    'forecasted_demand': stmt.excluded.forecasted_demand,
+                    'forecasted_occupancy': stmt.excluded.forecasted_occupancy,
+                    'inventory_count_snap': stmt.excluded.inventory_count_snap,
+                    'variable_cost_snap': stmt.excluded.variable_cost_snap,
+                    'updated_at': func.now(),
+                },
+            )
+            self.db.execute(stmt)
         self.db.commit()
+
+        # The Core upsert bypasses the RoomPricing ORM write listeners
+        # that normally drop these namespaces, so invalidate explicitly
+        invalidate_namespace("analytics")
+        invalidate_namespace("room_pricing")
+
+        # Keep the analytics view in sync with the new pricing rows
+        refresh_pricing_view(self.db.get_bind())
     
     def apply_price_override(
         self,
@@ -298,7 +537,7 @@ class DynamicPricingEngine:
             pricing.override_notes = notes
         else:
             # Get room type for suggested price calculation
-            room_type = self.db.query(RoomType).filter(RoomType.id == room_type_id).first()
+            room_type = get_entity_cached(self.db, RoomType, room_type_id)
             if not room_type:
                 raise ValueError(f"Room type with ID {room_type_id} not found")
             
@@ -314,11 +553,14 @@ class DynamicPricingEngine:
                 forecasted_occupancy=0.5  # Default to 50% occupancy
             )
             self.db.add(pricing)
-        
+
         self.db.commit()
-        
+
+        # Keep the analytics view in sync with the override
+        refresh_pricing_view(self.db.get_bind())
+
         # Get room type details for response
-        room_type = self.db.query(RoomType).filter(RoomType.id == room_type_id).first()
+        room_type = get_entity_cached(self.db, RoomType, room_type_id)
         
         return {
             'room_type_id': room_type_id,
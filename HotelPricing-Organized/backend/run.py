@@ -1,15 +1,36 @@
-import uvicorn
+import argparse
 import os
-from app.db.init_db import init_db
+
+import uvicorn
 
 if __name__ == "__main__":
-    # Initialize the database with sample data
-    init_db()
-    
-    # Run the FastAPI application
+    parser = argparse.ArgumentParser(description="Run the pricing API server")
+    parser.add_argument(
+        "--init-db",
+        action="store_true",
+        help="Create/upgrade the schema and seed sample data before serving"
+    )
+    parser.add_argument(
+        "--reload",
+        action="store_true",
+        help="Enable the auto-reload file watcher (development only)"
+    )
+    args = parser.parse_args()
+
+    if args.init_db:
+        # Imported lazily so plain serves skip the model/DDL import cost
+        from app.db.init_db import init_db
+        init_db()
+
+    # uvloop/httptools replace the selector event loop and the pure-Python
+    # HTTP parser with C implementations; the reload watcher stays off in
+    # production so no fork or file-watching overhead is paid
     uvicorn.run(
         "app.main:app",
         host="0.0.0.0",
         port=int(os.getenv("PORT", 8000)),
-        reload=True
+        workers=int(os.getenv("WEB_CONCURRENCY", 1)),
+        loop="uvloop",
+        http="httptools",
+        reload=args.reload
     )